@@ -0,0 +1,60 @@
+import base64
+import binascii
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from Hashing import sha512_256
+
+ADDRESS_LENGTH = 58
+PARALLEL_THRESHOLD = 200000
+
+
+def decode_address_checked(addr) -> tuple:
+    """returns (public key, "") for a valid address or (None, reason) for an invalid one"""
+    if not isinstance(addr, str):
+        return None, "not a string"
+    if len(addr) != ADDRESS_LENGTH:
+        return None, f"length {len(addr)}, expected {ADDRESS_LENGTH}"
+    try:
+        decoded = base64.b32decode(addr + "======")
+    except binascii.Error:
+        return None, "not base32"
+    public_key, checksum = decoded[:32], decoded[32:]
+    if sha512_256(public_key)[-4:] != checksum:
+        return None, "bad checksum"
+    return public_key, ""
+
+def _decode_chunk(chunk: list) -> list:
+    return [decode_address_checked(addr) for addr in chunk]
+
+def _decode_all(addresses: list, workers: int = None, chunk_size: int = 10000) -> list:
+    if workers == 1 or len(addresses) < PARALLEL_THRESHOLD:
+        return _decode_chunk(addresses)
+    chunks = [addresses[i:i + chunk_size] for i in range(0, len(addresses), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        return [result for chunk in pool.map(_decode_chunk, chunks) for result in chunk]
+
+def validate_addresses(addresses, workers: int = None, return_keys: bool = False) -> dict:
+    """validate a recipient list in bulk, deduplicating and reporting invalid rows with reasons"""
+    addresses = [addr.strip() if isinstance(addr, str) else addr for addr in addresses]
+    first_row = {}
+    for row, addr in enumerate(addresses):
+        if isinstance(addr, str):
+            first_row.setdefault(addr, row)
+    # each distinct address is decoded once, however often it repeats
+    unique = list(first_row)
+    decoded = dict(zip(unique, _decode_all(unique, workers)))
+    report = {"valid": [], "invalid": [], "duplicates": []}
+    if return_keys:
+        report["keys"] = []
+    for row, addr in enumerate(addresses):
+        public_key, reason = decoded[addr] if isinstance(addr, str) else decode_address_checked(addr)
+        if public_key is None:
+            report["invalid"].append({"row": row, "address": addr, "reason": reason})
+        elif first_row[addr] != row:
+            report["duplicates"].append({"row": row, "address": addr, "first_row": first_row[addr]})
+        else:
+            report["valid"].append(addr)
+            if return_keys:
+                report["keys"].append(public_key)
+    return report
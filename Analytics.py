@@ -0,0 +1,143 @@
+import numpy as np
+from algosdk.v2client.indexer import IndexerClient
+
+from Misc import iter_account_transactions
+
+
+class aHistoryColumns:
+    """an account's pay and asset transfer history as columnar arrays, asset id 0 is algo"""
+    def __init__(self, wallet_addr: str, addresses: list, rounds, times, sender_ids, receiver_ids, asset_ids, amounts):
+        self.wallet_addr = wallet_addr
+        self.addresses = addresses
+        self.rounds = rounds
+        self.times = times
+        self.sender_ids = sender_ids
+        self.receiver_ids = receiver_ids
+        self.asset_ids = asset_ids
+        self.amounts = amounts
+        self.account_id = addresses.index(wallet_addr) if wallet_addr in addresses else -1
+
+    @classmethod
+    def from_movements(cls, wallet_addr: str, movements) -> "aHistoryColumns":
+        """build the columns from (round, time, sender, receiver, asset_id, amount) tuples"""
+        address_ids = {wallet_addr: 0}
+        rounds, times, senders, receivers, assets, amounts = [], [], [], [], [], []
+        for confirmed_round, round_time, sender, receiver, asset_id, amount in movements:
+            rounds.append(confirmed_round)
+            times.append(round_time)
+            senders.append(address_ids.setdefault(sender, len(address_ids)))
+            receivers.append(address_ids.setdefault(receiver, len(address_ids)))
+            assets.append(asset_id)
+            amounts.append(amount)
+        return cls(
+            wallet_addr,
+            list(address_ids),
+            np.array(rounds, dtype=np.uint64),
+            np.array(times, dtype=np.int64),
+            np.array(senders, dtype=np.int32),
+            np.array(receivers, dtype=np.int32),
+            np.array(assets, dtype=np.uint64),
+            np.array(amounts, dtype=np.uint64))
+
+    @classmethod
+    def from_records(cls, wallet_addr: str, records) -> "aHistoryColumns":
+        """build the columns from PayRecord/AxferRecord objects, records carry no close amounts or clawback source"""
+        return cls.from_movements(wallet_addr, ((record.confirmed_round, record.round_time, record.sender, record.receiver,
+            getattr(record, "asset_id", 0), record.amount) for record in records))
+
+    @staticmethod
+    def movements(transaction: dict):
+        """every amount an indexer pay or axfer transaction moves, close-outs included and clawbacks taken
+        from the revoked account"""
+        confirmed_round = transaction.get("confirmed-round", 0)
+        round_time = transaction["round-time"]
+        if "payment-transaction" in transaction:
+            pay = transaction["payment-transaction"]
+            sender, asset_id = transaction["sender"], 0
+            moves = ((pay["receiver"], pay["amount"]), (pay.get("close-remainder-to"), pay.get("close-amount", 0)))
+        else:
+            axfer = transaction["asset-transfer-transaction"]
+            # on a clawback the indexer reports the revoked account as the transfer sender
+            sender, asset_id = axfer.get("sender") or transaction["sender"], axfer["asset-id"]
+            moves = ((axfer["receiver"], axfer["amount"]), (axfer.get("close-to"), axfer.get("close-amount", 0)))
+        for index, (receiver, amount) in enumerate(moves):
+            # a plain transfer of 0 is still a row, an empty close is not
+            if receiver and (amount or index == 0):
+                yield confirmed_round, round_time, sender, receiver, asset_id, int(amount)
+
+    @classmethod
+    def from_indexer(cls, client: IndexerClient, wallet_addr: str, min_round: int = None) -> "aHistoryColumns":
+        """page through the full pay and axfer history of an account"""
+        def movements():
+            for txn_type in ("pay", "axfer"):
+                for transaction in iter_account_transactions(client, wallet_addr, txn_type=txn_type, min_round=min_round):
+                    yield from cls.movements(transaction)
+        return cls.from_movements(wallet_addr, movements())
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    def _mask(self, asset_id: int = None):
+        if asset_id is None:
+            return np.ones(len(self.amounts), dtype=bool)
+        return self.asset_ids == asset_id
+
+    @staticmethod
+    def _grouped_sum(keys, values) -> tuple:
+        """exact integer sums of values per distinct key"""
+        if len(keys) == 0:
+            return keys[:0], values[:0]
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        return keys[starts], np.add.reduceat(values[order], starts)
+
+    def volume_by_period(self, period_seconds: int = 86400, asset_id: int = None) -> dict:
+        """total transferred amount per asset id and time bucket, {asset_id: {bucket start timestamp: amount}},
+        amounts of different assets are never added together"""
+        mask = self._mask(asset_id)
+        volume = {}
+        if not mask.any():
+            return volume
+        assets = self.asset_ids[mask]
+        buckets = (self.times[mask] // period_seconds) * period_seconds
+        # one sort on (asset, bucket) and one reduceat over the runs
+        order = np.lexsort((buckets, assets))
+        assets = assets[order]
+        buckets = buckets[order]
+        starts = np.flatnonzero(np.r_[True, (assets[1:] != assets[:-1]) | (buckets[1:] != buckets[:-1])])
+        sums = np.add.reduceat(self.amounts[mask][order], starts)
+        for asset, bucket, total in zip(assets[starts].tolist(), buckets[starts].tolist(), sums.tolist()):
+            volume.setdefault(asset, {})[bucket] = total
+        return volume
+
+    def net_flow_by_asset(self) -> dict:
+        """received minus sent per asset id, in base units"""
+        incoming = self.receiver_ids == self.account_id
+        outgoing = self.sender_ids == self.account_id
+        flow = {}
+        for direction, mask in ((1, incoming), (-1, outgoing)):
+            keys, sums = self._grouped_sum(self.asset_ids[mask], self.amounts[mask])
+            for key, total in zip(keys.tolist(), sums.tolist()):
+                flow[key] = flow.get(key, 0) + direction * total
+        return flow
+
+    def top_counterparties(self, n: int = 10, asset_id: int = None, by: str = "volume") -> list:
+        """rank the addresses this account transacted with by volume of one asset or by transaction count"""
+        if by == "volume" and asset_id is None:
+            raise ValueError("ranking by volume needs an asset_id, amounts of different assets can't be added")
+        mask = self._mask(asset_id)
+        senders = self.sender_ids[mask]
+        others = np.where(senders == self.account_id, self.receiver_ids[mask], senders)
+        keep = others != self.account_id
+        others = others[keep]
+        counts = np.bincount(others, minlength=len(self.addresses))
+        keys, volumes = self._grouped_sum(others, self.amounts[mask][keep])
+        if by == "count":
+            ranking = np.argsort(-counts[keys], kind="stable")
+        else:
+            ranking = np.argsort(volumes, kind="stable")[::-1]
+        return [{
+            "address": self.addresses[keys[i]],
+            "count": int(counts[keys[i]]),
+            "volume": int(volumes[i]) if asset_id is not None else None} for i in ranking[:n]]
@@ -0,0 +1,162 @@
+import gzip
+import json
+from bisect import bisect_left, insort
+
+from algosdk.v2client.indexer import IndexerClient
+
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class aAssetIndex:
+    """local searchable copy of indexer asset params, kept fresh from asset config transactions"""
+    def __init__(self, indexer_client: IndexerClient):
+        self.indexer_client = indexer_client
+        self.assets = {}
+        self.sorted_keys = {"name": [], "unit": []}
+        self.trigrams = {"name": {}, "unit": {}}
+        self.last_round = 0
+
+    def _fields(self, asset: dict) -> dict:
+        return {"name": asset["name"].lower(), "unit": asset["unit"].lower()}
+
+    def _add(self, asset: dict) -> None:
+        if asset["id"] in self.assets:
+            self._remove(asset["id"])
+        self.assets[asset["id"]] = asset
+        for field, text in self._fields(asset).items():
+            insort(self.sorted_keys[field], (text, asset["id"]))
+            for gram in _trigrams(text):
+                self.trigrams[field].setdefault(gram, set()).add(asset["id"])
+
+    def _remove(self, asset_id: int) -> None:
+        asset = self.assets.pop(asset_id)
+        for field, text in self._fields(asset).items():
+            keys = self.sorted_keys[field]
+            del keys[bisect_left(keys, (text, asset_id))]
+            for gram in _trigrams(text):
+                self.trigrams[field][gram].discard(asset_id)
+
+    @staticmethod
+    def _from_indexer(asset: dict) -> dict:
+        params = asset.get("params", {})
+        return {
+            "id": asset["index"],
+            "name": params.get("name", ""),
+            "unit": params.get("unit-name", ""),
+            "url": params.get("url", ""),
+            "creator": params.get("creator", ""),
+            "decimals": params.get("decimals", 0),
+            "total": params.get("total", 0),
+            "deleted": asset.get("deleted", False),
+            "created_round": asset.get("created-at-round", 0)}
+
+    def build(self, page_size: int = 1000, creator: str = None) -> int:
+        """page through indexer asset search and index every asset, returns the number indexed"""
+        next_page = None
+        while True:
+            response = self.indexer_client.search_assets(limit=page_size, next_page=next_page, creator=creator, include_all=True)
+            for asset in response.get("assets", []):
+                self._add(self._from_indexer(asset))
+            self.last_round = max(self.last_round, response.get("current-round", 0))
+            next_page = response.get("next-token")
+            if not next_page or not response.get("assets"):
+                break
+        return len(self.assets)
+
+    def _apply(self, txn: dict) -> int:
+        """apply one acfg transaction, inner transactions included, returns how many assets changed"""
+        changed = 0
+        config = txn.get("asset-config-transaction")
+        if config is not None:
+            asset_id = txn.get("created-asset-index") or config.get("asset-id")
+            if asset_id and ("created-asset-index" in txn or asset_id not in self.assets):
+                self._add(self._from_indexer(self.indexer_client.asset_info(asset_id, include_all=True)["asset"]))
+                changed += 1
+            elif asset_id and not config.get("params"):
+                self.assets[asset_id]["deleted"] = True
+                changed += 1
+        # an acfg made by an application is returned as its root transaction
+        for inner in txn.get("inner-txns", []):
+            changed += self._apply(inner)
+        return changed
+
+    def refresh(self, page_size: int = 1000) -> int:
+        """apply asset creations and destructions since the last indexed round"""
+        next_page = None
+        changed = 0
+        current_round = self.last_round
+        while True:
+            response = self.indexer_client.search_transactions(limit=page_size, next_page=next_page,
+                txn_type="acfg", min_round=self.last_round + 1)
+            for txn in response.get("transactions", []):
+                changed += self._apply(txn)
+            current_round = max(current_round, response.get("current-round", 0))
+            next_page = response.get("next-token")
+            if not next_page or not response.get("transactions"):
+                break
+        # only once every page is in, a failed page is read again by the next refresh
+        self.last_round = current_round
+        return changed
+
+    def _prefix_ids(self, field: str, prefix: str) -> list:
+        keys = self.sorted_keys[field]
+        ids = []
+        i = bisect_left(keys, (prefix, -1))
+        while i < len(keys) and keys[i][0].startswith(prefix):
+            ids.append(keys[i][1])
+            i += 1
+        return ids
+
+    def _substring_ids(self, field: str, text: str) -> list:
+        if len(text) < 3:
+            return [asset_id for key, asset_id in self.sorted_keys[field] if text in key]
+        candidates = None
+        for gram in _trigrams(text):
+            ids = self.trigrams[field].get(gram, set())
+            candidates = set(ids) if candidates is None else candidates & ids
+            if not candidates:
+                return []
+        return sorted(i for i in candidates if text in self._fields(self.assets[i])[field])
+
+    def search(self, query: str = "", field: str = "any", mode: str = "prefix", creator: str = None,
+        decimals: int = None, deleted: bool = False, limit: int = 50) -> list:
+        """search by name and/or unit, mode is prefix or substring"""
+        query = query.lower()
+        fields = ["name", "unit"] if field == "any" else [field]
+        lookup = self._prefix_ids if mode == "prefix" else self._substring_ids
+        results = []
+        seen = set()
+        for name in fields:
+            for asset_id in lookup(name, query):
+                if asset_id in seen:
+                    continue
+                seen.add(asset_id)
+                asset = self.assets[asset_id]
+                if creator is not None and asset["creator"] != creator:
+                    continue
+                if decimals is not None and asset["decimals"] != decimals:
+                    continue
+                if deleted is not None and asset["deleted"] != deleted:
+                    continue
+                results.append(asset)
+                if len(results) >= limit:
+                    return results
+        return results
+
+    def save(self, path: str) -> None:
+        """write a gzip json snapshot of the index"""
+        with gzip.open(path, "wt") as f:
+            json.dump({"round": self.last_round, "assets": list(self.assets.values())}, f)
+
+    @classmethod
+    def load(cls, indexer_client: IndexerClient, path: str) -> "aAssetIndex":
+        """rebuild the index from a snapshot, call refresh() to catch up"""
+        index = cls(indexer_client)
+        with gzip.open(path, "rt") as f:
+            snapshot = json.load(f)
+        for asset in snapshot["assets"]:
+            index._add(asset)
+        index.last_round = snapshot["round"]
+        return index
@@ -6,14 +6,18 @@ from algosdk.future.transaction import (AssetConfigTxn, AssetTransferTxn,
                                         PaymentTxn)
 from algosdk.v2client.algod import AlgodClient
 
+from Batch import aBatch
+from Params import aParams
+from Submit import aSubmitter
 
-class aAsset(AlgodClient):
+
+class aAsset(aParams, aSubmitter, AlgodClient):
     def __init__(self, algod_url: str, txns_fee: int, explorer_tx_url: str):
         self.algod_client = AlgodClient("", algod_url)
-        self.params = self.algod_client.suggested_params()
-        self.params.flat_fee = True
-        self.params.fee = txns_fee
+        self.txns_fee = txns_fee
         self.explorer_tx_url = explorer_tx_url
+        self.submit_queue = None # optional Submit.aSubmitQueue
+        self.validator = None # optional Validate.aGroupValidator
 
     def to_mainnet(self) -> bool:
         """change client to mainnet"""
@@ -27,14 +31,24 @@ class aAsset(AlgodClient):
         self.explorer_tx_url = "https://testnet.algoexplorer.io/tx/"
         return False
     
+    def batch(self, sender_addr: str, eng_id: Union[int, None], fee_addr: str, pool_fees: bool = False, fee: int = None) -> aBatch:
+        """start a batch, pass it as batch= to group several operations with one asset creation fee per group"""
+        sp = self.txn_params(fee)
+        return aBatch(sender_addr, sp, eng_id, fee_addr, fee_note="asset creation fee", pool_fees=pool_fees)
+
+    def send_batch(self, batch: aBatch, sender_key: str) -> list:
+        """sign and submit every group of a batch"""
+        return batch.sign_and_send(sender_key, self.submitter, self.explorer_tx_url)
+
     def custom_asset(self, sender_key: str, name: str, unit: str, total_supply: int, decimal: int, df_frozen: bool, url: str, mt_hash: bytes,
         manager_addr: str, reserve_addr: str, freeze_addr: str, clawback_addr: str,
-        eng_id: Union[int, None], fee_addr: str, fee_amount: int) -> dict:
+        eng_id: Union[int, None], fee_addr: str, fee_amount: int, batch: aBatch = None, fee: int = None) -> dict:
         """create custom asset"""
+        sp = self.txn_params(fee)
 
         txn1 = AssetConfigTxn(
         sender=account.address_from_private_key(sender_key),
-        sp=self.params,
+        sp=sp,
         total=total_supply, # 18 quintillion
         default_frozen=df_frozen, # bool
         unit_name=unit, # max 8
@@ -46,10 +60,12 @@ class aAsset(AlgodClient):
         url=url, # max 32
         decimals=decimal, # max 19
         metadata_hash=mt_hash,) # req 32 b''
-        txn2 = PaymentTxn(account.address_from_private_key(sender_key), self.params, fee_addr, fee_amount, note="asset creation fee")
+        if batch is not None:
+            return batch.add(txn1, fee_amount)
+        txn2 = PaymentTxn(account.address_from_private_key(sender_key), sp, fee_addr, fee_amount, note="asset creation fee")
 
         if isinstance(eng_id, int):
-            txn2 = AssetTransferTxn(account.address_from_private_key(sender_key), self.params, fee_addr, fee_amount, eng_id, note="asset creation fee")
+            txn2 = AssetTransferTxn(account.address_from_private_key(sender_key), sp, fee_addr, fee_amount, eng_id, note="asset creation fee")
 
         gid = transaction.calculate_group_id([txn1, txn2])
         txn1.group = gid
@@ -59,19 +75,20 @@ class aAsset(AlgodClient):
         stxn2 = txn2.sign(sender_key)
         signed_group = [stxn1, stxn2]
 
-        txid = self.algod_client.send_transactions(signed_group)
+        txid = self.submitter.send_transactions(signed_group)
         transactioninfo = {}
         transactioninfo['txid'] = txid
         transactioninfo['link'] = f"{self.explorer_tx_url}{txid}"
         return transactioninfo
 
     def create_token(self, sender_key: str, name: str, unit: str, total_supply: int, decimal: int, url: str,
-        eng_id: Union[int, None], fee_addr: str, fee_amount: int) -> dict:
+        eng_id: Union[int, None], fee_addr: str, fee_amount: int, batch: aBatch = None, fee: int = None) -> dict:
         """create token"""
+        sp = self.txn_params(fee)
 
         txn1 = AssetConfigTxn(strict_empty_address_check=False,
         sender=account.address_from_private_key(sender_key),
-        sp=self.params,
+        sp=sp,
         total=total_supply, # max 18 quintillion
         default_frozen=False, # bool
         unit_name=unit, # max 8
@@ -82,10 +99,12 @@ class aAsset(AlgodClient):
         clawback="",
         url=url, # max 32
         decimals=decimal)
-        txn2 = PaymentTxn(account.address_from_private_key(sender_key), self.params, fee_addr, fee_amount, note="asset creation fee")
+        if batch is not None:
+            return batch.add(txn1, fee_amount)
+        txn2 = PaymentTxn(account.address_from_private_key(sender_key), sp, fee_addr, fee_amount, note="asset creation fee")
 
         if isinstance(eng_id, int):
-            txn2 = AssetTransferTxn(account.address_from_private_key(sender_key), self.params, fee_addr, fee_amount, eng_id, note="asset creation fee")
+            txn2 = AssetTransferTxn(account.address_from_private_key(sender_key), sp, fee_addr, fee_amount, eng_id, note="asset creation fee")
 
         gid = transaction.calculate_group_id([txn1, txn2])
         txn1.group = gid
@@ -95,7 +114,7 @@ class aAsset(AlgodClient):
         stxn2 = txn2.sign(sender_key)
 
         signed_group =  [stxn1, stxn2]
-        txid = self.algod_client.send_transactions(signed_group)
+        txid = self.submitter.send_transactions(signed_group)
 
         transactioninfo = {}
         transactioninfo['txid'] = txid
@@ -107,12 +126,13 @@ class aAsset(AlgodClient):
     # "algo", None, "HZN5PECG77YA4R5D4HNI3SXQU67IYZ5QULYVIC6ME52OJLJTM2IOZAUZYY", 1000000, "noted"))
 
     def create_pure_nft(self, sender_key: str, name: str, unit: str, url: str,
-        eng_id: Union[int, None], fee_addr: str, fee_amount: int) -> dict:
+        eng_id: Union[int, None], fee_addr: str, fee_amount: int, mt_hash: bytes = None, batch: aBatch = None, fee: int = None) -> dict:
         """create pure nft"""
+        sp = self.txn_params(fee)
 
         txn1 = AssetConfigTxn(strict_empty_address_check=False,
         sender=account.address_from_private_key(sender_key),
-        sp=self.params,
+        sp=sp,
         total=1, # max 18 quintillion
         default_frozen=False, # bool
         unit_name=unit, # max 8
@@ -122,11 +142,13 @@ class aAsset(AlgodClient):
         freeze="",
         clawback="",
         url=url, # max 32 url to information about nft or asset
-        ) # max 19
-        txn2 = PaymentTxn(account.address_from_private_key(sender_key), self.params, fee_addr, fee_amount, note="asset creation fee")
+        metadata_hash=mt_hash) # max 19
+        if batch is not None:
+            return batch.add(txn1, fee_amount)
+        txn2 = PaymentTxn(account.address_from_private_key(sender_key), sp, fee_addr, fee_amount, note="asset creation fee")
 
         if isinstance(eng_id, int):
-            txn2 = AssetTransferTxn(account.address_from_private_key(sender_key), self.params, fee_addr, fee_amount, eng_id, note="asset creation fee")
+            txn2 = AssetTransferTxn(account.address_from_private_key(sender_key), sp, fee_addr, fee_amount, eng_id, note="asset creation fee")
 
         gid = transaction.calculate_group_id([txn1, txn2])
         txn1.group = gid
@@ -136,7 +158,7 @@ class aAsset(AlgodClient):
         stxn2 = txn2.sign(sender_key)
 
         signed_group =  [stxn1, stxn2]
-        txid = self.algod_client.send_transactions(signed_group)
+        txid = self.submitter.send_transactions(signed_group)
 
         transactioninfo = {}
         transactioninfo['txid'] = txid
@@ -144,11 +166,12 @@ class aAsset(AlgodClient):
         return transactioninfo
 
     def web3_tickets(self, sender_key: str, name: str, url: str, total_supply: int,
-        eng_id: Union[int, None], fee_addr: str, fee_amount: int) -> dict:
+        eng_id: Union[int, None], fee_addr: str, fee_amount: int, batch: aBatch = None, fee: int = None) -> dict:
         """create web3 ticket"""
+        sp = self.txn_params(fee)
         txn1 = AssetConfigTxn(
         sender=account.address_from_private_key(sender_key),
-        sp=self.params,
+        sp=sp,
         total=total_supply, # max 18 quintillion
         default_frozen=False, # bool
         unit_name="WEB3TCKT", # max 8
@@ -158,10 +181,12 @@ class aAsset(AlgodClient):
         clawback=account.address_from_private_key(sender_key),
         url=url, # max 32
         decimals=0)
-        txn2 = PaymentTxn(account.address_from_private_key(sender_key), self.params, fee_addr, fee_amount, note="asset creation fee")
+        if batch is not None:
+            return batch.add(txn1, fee_amount)
+        txn2 = PaymentTxn(account.address_from_private_key(sender_key), sp, fee_addr, fee_amount, note="asset creation fee")
 
         if isinstance(eng_id, int):
-            txn2 = AssetTransferTxn(account.address_from_private_key(sender_key), self.params, fee_addr, fee_amount, eng_id, note="asset creation fee")
+            txn2 = AssetTransferTxn(account.address_from_private_key(sender_key), sp, fee_addr, fee_amount, eng_id, note="asset creation fee")
 
         gid = transaction.calculate_group_id([txn1, txn2])
         txn1.group = gid
@@ -171,7 +196,7 @@ class aAsset(AlgodClient):
         stxn2 = txn2.sign(sender_key)
 
         signed_group =  [stxn1, stxn2]
-        txid = self.algod_client.send_transactions(signed_group)
+        txid = self.submitter.send_transactions(signed_group)
 
         transactioninfo = {}
         transactioninfo['txid'] = txid
@@ -179,11 +204,12 @@ class aAsset(AlgodClient):
         return transactioninfo
 
     def create_nft_collection(self, sender_key: str, name: str, unit: str, total: int, url: str,
-        eng_id: Union[int, None], fee_addr: str, fee_amount: int) -> dict:
+        eng_id: Union[int, None], fee_addr: str, fee_amount: int, mt_hash: bytes = None, batch: aBatch = None, fee: int = None) -> dict:
         """create nft collection"""
+        sp = self.txn_params(fee)
         txn1 = AssetConfigTxn(strict_empty_address_check=False,
         sender=account.address_from_private_key(sender_key),
-        sp=self.params,
+        sp=sp,
         total=total, # max 18 quintillion
         default_frozen=False, # bool
         unit_name=unit, # max 8
@@ -193,11 +219,14 @@ class aAsset(AlgodClient):
         freeze="",
         clawback="",
         url=url, # max 32
-        decimals=0)
-        txn2 = PaymentTxn(account.address_from_private_key(sender_key), self.params, fee_addr, fee_amount, note="asset creation fee")
+        decimals=0,
+        metadata_hash=mt_hash)
+        if batch is not None:
+            return batch.add(txn1, fee_amount)
+        txn2 = PaymentTxn(account.address_from_private_key(sender_key), sp, fee_addr, fee_amount, note="asset creation fee")
 
         if isinstance(eng_id, int):
-            txn2 = AssetTransferTxn(account.address_from_private_key(sender_key), self.params, fee_addr, fee_amount, eng_id, note="asset creation fee")
+            txn2 = AssetTransferTxn(account.address_from_private_key(sender_key), sp, fee_addr, fee_amount, eng_id, note="asset creation fee")
 
         gid = transaction.calculate_group_id([txn1, txn2])
         txn1.group = gid
@@ -207,7 +236,7 @@ class aAsset(AlgodClient):
         stxn2 = txn2.sign(sender_key)
 
         signed_group =  [stxn1, stxn2]
-        txid = self.algod_client.send_transactions(signed_group)
+        txid = self.submitter.send_transactions(signed_group)
 
         transactioninfo = {}
         transactioninfo['txid'] = txid
@@ -215,11 +244,12 @@ class aAsset(AlgodClient):
         return transactioninfo
 
     def security_asset(self, sender_key: str, name: str, unit: str, total_supply: int, url: str, decimal: int,
-        eng_id: Union[int, None], fee_addr: str, fee_amount: int) -> dict:
+        eng_id: Union[int, None], fee_addr: str, fee_amount: int, batch: aBatch = None, fee: int = None) -> dict:
         """create a security asset"""
+        sp = self.txn_params(fee)
         txn1 = AssetConfigTxn(
         sender=account.address_from_private_key(sender_key),
-        sp=self.params,
+        sp=sp,
         total=total_supply, # max 18 quintillion
         default_frozen=False, # bool
         unit_name=unit, # max 8
@@ -230,10 +260,12 @@ class aAsset(AlgodClient):
         reserve=account.address_from_private_key(sender_key),
         url=url, # max 32 pointing to a the mtdata file
         decimals=decimal)
-        txn2 = PaymentTxn(account.address_from_private_key(sender_key), self.params, fee_addr, fee_amount, note="asset creation fee")
+        if batch is not None:
+            return batch.add(txn1, fee_amount)
+        txn2 = PaymentTxn(account.address_from_private_key(sender_key), sp, fee_addr, fee_amount, note="asset creation fee")
 
         if isinstance(eng_id, int):
-            txn2 = AssetTransferTxn(account.address_from_private_key(sender_key), self.params, fee_addr, fee_amount, eng_id, note="asset creation fee")
+            txn2 = AssetTransferTxn(account.address_from_private_key(sender_key), sp, fee_addr, fee_amount, eng_id, note="asset creation fee")
 
         gid = transaction.calculate_group_id([txn1, txn2])
         txn1.group = gid
@@ -243,7 +275,7 @@ class aAsset(AlgodClient):
         stxn2 = txn2.sign(sender_key)
 
         signed_group =  [stxn1, stxn2]
-        txid = self.algod_client.send_transactions(signed_group)
+        txid = self.submitter.send_transactions(signed_group)
 
         transactioninfo = {}
         transactioninfo['txid'] = txid
@@ -251,11 +283,12 @@ class aAsset(AlgodClient):
         return transactioninfo
 
     def create_fractional_nft(self, sender_key: str, name: str, unit: str, total_supply: int, 
-        url: str, decimal: int, eng_id: Union[int, None], fee_addr: str, fee_amount: int) -> dict:
+        url: str, decimal: int, eng_id: Union[int, None], fee_addr: str, fee_amount: int, mt_hash: bytes = None, batch: aBatch = None, fee: int = None) -> dict:
         """create fractional nft""" 
+        sp = self.txn_params(fee)
         txn1 = AssetConfigTxn(strict_empty_address_check=False,
         sender=account.address_from_private_key(sender_key),
-        sp=self.params,
+        sp=sp,
         total=total_supply, # max 18 quintillion
         default_frozen=False, # bool
         unit_name=unit, # max 8
@@ -265,11 +298,14 @@ class aAsset(AlgodClient):
         freeze="",
         clawback="",
         url=url, # max 32 pointing to a the mtdata file
-        decimals=decimal)
-        txn2 = PaymentTxn(account.address_from_private_key(sender_key), self.params, fee_addr, fee_amount, note="asset creation fee")
+        decimals=decimal,
+        metadata_hash=mt_hash)
+        if batch is not None:
+            return batch.add(txn1, fee_amount)
+        txn2 = PaymentTxn(account.address_from_private_key(sender_key), sp, fee_addr, fee_amount, note="asset creation fee")
 
         if isinstance(eng_id, int):
-            txn2 = AssetTransferTxn(account.address_from_private_key(sender_key), self.params, fee_addr, fee_amount, eng_id, note="asset creation fee")
+            txn2 = AssetTransferTxn(account.address_from_private_key(sender_key), sp, fee_addr, fee_amount, eng_id, note="asset creation fee")
 
         gid = transaction.calculate_group_id([txn1, txn2])
         txn1.group = gid
@@ -279,11 +315,9 @@ class aAsset(AlgodClient):
         stxn2 = txn2.sign(sender_key)
 
         signed_group =  [stxn1, stxn2]
-        txid = self.algod_client.send_transactions(signed_group)
+        txid = self.submitter.send_transactions(signed_group)
 
         transactioninfo = {}
         transactioninfo['txid'] = txid
         transactioninfo['link'] = f"{self.explorer_tx_url}{txid}"
-        return transactioninfo       
-
-af = aAsset("https://node.testnet.algoexplorerapi.io", 1000, "") #  "https://algoindexer.testnet.algoexplorerapi.io/", 1000, "", "", "")
\ No newline at end of file
+        return transactioninfo
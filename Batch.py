@@ -0,0 +1,87 @@
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
+from typing import Union
+
+from algosdk.future.transaction import (AssetTransferTxn, PaymentTxn,
+                                        calculate_group_id)
+
+MAX_GROUP_SIZE = 16
+
+
+def fee_txn(sender_addr: str, sp, eng_id: Union[int, None], fee_addr: str, fee_amount: int, note: str):
+    """the service fee payment, in algo or in the eng_id asset"""
+    if isinstance(eng_id, int):
+        return AssetTransferTxn(sender_addr, sp, fee_addr, fee_amount, eng_id, note=note)
+    return PaymentTxn(sender_addr, sp, fee_addr, fee_amount, note=note)
+
+
+class aBatch:
+    """operations by one sender grouped atomically with one aggregated service fee per group"""
+    def __init__(self, sender_addr: str, sp, eng_id: Union[int, None], fee_addr: str,
+        fee_note: str = "asset interaction fee", pool_fees: bool = False):
+        self.sender_addr = sender_addr
+        self.sp = sp
+        self.eng_id = eng_id
+        self.fee_addr = fee_addr
+        self.fee_note = fee_note
+        self.pool_fees = pool_fees
+        self.operations = []
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+    def add(self, txn, fee_amount: int = 0) -> dict:
+        """queue an operation and the service fee it would have paid on its own"""
+        if txn.sender != self.sender_addr:
+            raise ValueError("all operations in a batch must share the batch sender")
+        self.operations.append((txn, fee_amount))
+        return {"batched": len(self.operations) - 1}
+
+    def groups(self) -> list:
+        """pack the operations into atomic groups of at most 16, each with a single fee transaction"""
+        groups = []
+        per_group = MAX_GROUP_SIZE - 1
+        for start in range(0, len(self.operations), per_group):
+            chunk = self.operations[start:start + per_group]
+            txns = [copy(txn) for txn, _ in chunk]
+            total_fee = sum(fee_amount for _, fee_amount in chunk)
+            if total_fee > 0:
+                txns.append(fee_txn(self.sender_addr, self.sp, self.eng_id, self.fee_addr, total_fee, self.fee_note))
+            if self.pool_fees:
+                network_fee = sum(txn.fee for txn in txns)
+                for txn in txns:
+                    txn.fee = 0
+                txns[-1].fee = network_fee
+            if len(txns) > 1:
+                gid = calculate_group_id(txns)
+                for txn in txns:
+                    txn.group = gid
+            groups.append(txns)
+        return groups
+
+    def sign_and_send(self, sender_key: str, algod_client, explorer_tx_url: str) -> list:
+        """sign every group with the sender key and submit them in order"""
+        results = []
+        for txns in self.groups():
+            txid = algod_client.send_transactions([txn.sign(sender_key) for txn in txns])
+            results.append({"txid": txid, "link": f"{explorer_tx_url}{txid}", "count": len(txns)})
+        self.operations = []
+        return results
+
+    def send_concurrently(self, sender_key: str, algod_client, explorer_tx_url: str, workers: int = 4) -> list:
+        """sign and submit the groups with bounded concurrency, returns one result per queued operation"""
+        per_group = MAX_GROUP_SIZE - 1
+        groups = self.groups()
+
+        def submit(txns):
+            try:
+                txid = algod_client.send_transactions([txn.sign(sender_key) for txn in txns])
+                return {"txid": txid, "link": f"{explorer_tx_url}{txid}"}
+            except Exception as e:
+                return {"error": str(e)}
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            group_results = list(pool.map(submit, groups))
+        results = [dict(group_results[i // per_group]) for i in range(len(self.operations))]
+        self.operations = []
+        return results
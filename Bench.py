@@ -0,0 +1,255 @@
+import os
+import subprocess
+import sys
+
+MODULES = ["Misc", "Info", "Wallet", "Eng", "Assets", "EngClient"]
+
+
+def bench_imports(modules: list = None, repeat: int = 3) -> dict:
+    """import each module in a fresh interpreter, returns module -> best cumulative import time in ms"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for module in modules or MODULES:
+        best = None
+        for _ in range(repeat):
+            proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                cwd=here, capture_output=True, text=True, check=True)
+            # the last importtime line is the requested module, cumulative time is in microseconds
+            cumulative = int(proc.stderr.strip().splitlines()[-1].split("|")[1])
+            best = cumulative if best is None else min(best, cumulative)
+        results[module] = best / 1000
+    return results
+
+def check_concurrent_builders(threads: int = 16, iterations: int = 2000) -> dict:
+    """build from many threads with and without per-call fees while other threads change the default fee of the same
+    objects, asserts every transaction carries the fee it asked for or a published default, returns throughput"""
+    import random
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from copy import copy
+
+    from algosdk import account
+    from algosdk.future.transaction import SuggestedParams
+
+    from Eng import aEng
+    from Wallet import aWallet
+
+    sp = SuggestedParams(1000, 1, 1000, "SGO1GKSzyE7IEPItTxCByw9x8FmnrCDexi9/cOUJOiI=", "testnet-v1.0", flat_fee=True)
+    wallet = aWallet("http://localhost", "http://localhost", 1000, "", "", "")
+    eng = aEng("http://localhost", "http://localhost", "", 1000)
+    wallet.params = sp
+    eng.params = copy(sp)
+    _, addr = account.generate_account()
+    defaults = {1000, 1001, 5000}
+    overrides = [2000, 3000, 4000]
+
+    def work(seed: int) -> list:
+        rng = random.Random(seed)
+        wrong = []
+        for _ in range(iterations):
+            fee = rng.choice([None] + overrides)
+            if rng.random() < 0.05:
+                eng.modify_fee(rng.choice([1001, 5000]))
+                wallet.set_fee(rng.choice([1001, 5000]))
+            for txn in (wallet.send_algo(addr, addr, 1, "bench", fee=fee), eng.add_asset(addr, 10, fee=fee)):
+                # an override must never leak into the shared default, and the default must be a published one
+                if (fee is None and txn.get("fee") not in defaults) or (fee is not None and txn.get("fee") != fee):
+                    wrong.append((fee, txn.get("fee")))
+        return wrong
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        wrong = [mismatch for result in pool.map(work, range(threads)) for mismatch in result]
+    elapsed = time.perf_counter() - start
+    assert not wrong, f"{len(wrong)} transactions built with the wrong fee, e.g. (requested, built) {wrong[:5]}"
+    assert eng.params.fee == eng.txns_fee and wallet.params.fee == wallet.txns_fee, "default params and txns_fee diverged"
+    built = threads * iterations * 2
+    return {"transactions": built, "per_second": built / elapsed}
+
+def check_params_refresh(threads: int = 16, iterations: int = 2000, round_seconds: float = 0.002) -> dict:
+    """build from many threads on one shared object while its params expire and are re-fetched and other threads
+    change the default fee, asserts no transaction is built from params older than a few refreshes"""
+    import random
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    from algosdk import account
+    from algosdk.future.transaction import SuggestedParams
+
+    from Eng import aEng
+
+    class RoundClock:
+        """stands in for algod, a new round every round_seconds"""
+        fetches = 0
+
+        def __init__(self):
+            self.start = time.monotonic()
+
+        def round(self) -> int:
+            return int((time.monotonic() - self.start) / round_seconds) + 1
+
+        def suggested_params(self):
+            self.fetches += 1
+            first = self.round()
+            return SuggestedParams(1000, first, first + 1000, "SGO1GKSzyE7IEPItTxCByw9x8FmnrCDexi9/cOUJOiI=", "testnet-v1.0")
+
+    eng = aEng("http://localhost", "http://localhost", "", 1000)
+    clock = eng.algod_client = RoundClock()
+    eng.params_max_age = round_seconds * 5
+    # a fetch is at most params_max_age old, the rest covers threads waiting on the lock
+    max_lag = 100
+    _, addr = account.generate_account()
+
+    def work(seed: int) -> list:
+        rng = random.Random(seed)
+        wrong = []
+        for _ in range(iterations):
+            fee = rng.choice([None, 2000])
+            if rng.random() < 0.05:
+                eng.modify_fee(rng.choice([1001, 5000]))
+            current = clock.round()
+            txn = eng.add_asset(addr, 10, fee=fee)
+            if current - txn["fv"] > max_lag or txn["lv"] - txn["fv"] != 1000:
+                wrong.append(("rounds", current, txn["fv"], txn["lv"]))
+            if (fee is None and txn.get("fee") not in {1000, 1001, 5000}) or (fee is not None and txn.get("fee") != fee):
+                wrong.append(("fee", fee, txn.get("fee")))
+        return wrong
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        wrong = [mismatch for result in pool.map(work, range(threads)) for mismatch in result]
+    elapsed = time.perf_counter() - start
+    assert not wrong, f"{len(wrong)} transactions built from stale params or with the wrong fee, e.g. {wrong[:5]}"
+    assert clock.fetches > 1, "params were never refreshed"
+    assert eng.params.fee == eng.txns_fee, "default params and txns_fee diverged"
+    return {"transactions": threads * iterations, "per_second": threads * iterations / elapsed, "fetches": clock.fetches}
+
+def bench_order_book(orders: int = 100000, cancel_ratio: float = 0.1) -> dict:
+    """place random orders around a mid price, cancel some, then match the book in one batch"""
+    import random
+    import time
+
+    from Exchange import BUY, SELL, aOrderBook
+
+    rng = random.Random(1)
+    book = aOrderBook(10458941, 0)
+    start = time.perf_counter()
+    ids = [book.place("trader", rng.choice((BUY, SELL)), rng.randint(950, 1050), rng.randint(1, 100)) for _ in range(orders)]
+    for order_id in rng.sample(ids, int(orders * cancel_ratio)):
+        book.cancel(order_id)
+    placed = time.perf_counter()
+    trades = book.match()
+    matched = time.perf_counter()
+    return {
+        "orders": orders,
+        "place_cancel_per_second": orders / (placed - start),
+        "trades": len(trades),
+        "match_seconds": matched - placed}
+
+def bench_json_stream(assets: int = 50000, local_states: int = 20000, chunk_size: int = 1 << 16) -> dict:
+    """full json.loads of a large account response against streaming only its assets array,
+    the apps-local-state array comes first so the stream has to skip a large value off the path"""
+    import json
+    import time
+    import tracemalloc
+
+    from Stream import iter_json_items
+
+    holding = {"amount": 0, "asset-id": 10458941, "deleted": False, "is-frozen": False, "opted-in-at-round": 19939513}
+    local_state = {"id": 1, "key-value": [{"key": "Y291bnQ=", "value": {"bytes": "", "type": 2, "uint": 7}}],
+        "schema": {"num-byte-slice": 0, "num-uint": 1}}
+    body = json.dumps({"account": {"address": "VQIMXAPONHJV3W2HIQACCZWNUC5JIVWIFHRAV35ZH524M6NIZJXXHTLPJE",
+        "amount": 397000, "apps-local-state": [dict(local_state, id=i) for i in range(local_states)],
+        "assets": [dict(holding, **{"asset-id": i}) for i in range(assets)]}, "current-round": 1}).encode()
+    chunks = lambda: (body[i:i + chunk_size] for i in range(0, len(body), chunk_size))
+
+    def measure(parse) -> tuple:
+        tracemalloc.start()
+        start = time.perf_counter()
+        found = parse()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return found, elapsed, peak
+
+    def full_load() -> int:
+        data = json.loads(b"".join(chunks()))
+        return sum(1 for asset in data["account"]["assets"] if asset["amount"] == 0)
+
+    def streamed() -> int:
+        return sum(1 for asset in iter_json_items(chunks(), ("account", "assets")) if asset["amount"] == 0)
+
+    full = measure(full_load)
+    stream = measure(streamed)
+    return {
+        "bytes": len(body),
+        "full_seconds": full[1], "full_peak_mb": full[2] / 1e6,
+        "stream_seconds": stream[1], "stream_peak_mb": stream[2] / 1e6,
+        "same_result": full[0] == stream[0]}
+
+
+def bench_export(txns: int = 5000) -> dict:
+    """json of base64 encoded transactions against one msgpack buffer of groups.
+    both paths spend nearly all their time in the sdk's dictify, so encode time is about the same,
+    what the buffer saves is size (no base64, no json framing) and one decode for the whole batch"""
+    import json
+    import time
+
+    from algosdk import encoding
+    from algosdk.future.transaction import PaymentTxn, SuggestedParams
+
+    from Export import export_unsigned, import_unsigned
+
+    addr = "VQIMXAPONHJV3W2HIQACCZWNUC5JIVWIFHRAV35ZH524M6NIZJXXHTLPJE"
+    sp = SuggestedParams(1000, 19939513, 19940513, "SGO1GKSzyE7IEPItTxCByw9x8FmnrCDexi9/cOUJOiI=", "testnet-v1.0", flat_fee=True)
+    batch = [PaymentTxn(addr, sp, addr, i, note="bench") for i in range(txns)]
+    start = time.perf_counter()
+    as_json = json.dumps([encoding.msgpack_encode(txn) for txn in batch]).encode()
+    json_done = time.perf_counter()
+    packed = export_unsigned(batch)
+    packed_done = time.perf_counter()
+    back = import_unsigned(packed)
+    loaded = time.perf_counter()
+    return {
+        "txns": txns,
+        "json_bytes": len(as_json), "json_seconds": json_done - start,
+        "msgpack_bytes": len(packed), "msgpack_seconds": packed_done - json_done,
+        "size_ratio": len(packed) / len(as_json),
+        "import_seconds": loaded - packed_done,
+        "same_txids": [group[0].get_txid() for group in back] == [txn.get_txid() for txn in batch]}
+
+
+def bench_encoder(txns: int = 20000) -> dict:
+    """PaymentTxn construction and msgpack_encode against patching a pre-encoded template"""
+    import base64
+    import time
+
+    from algosdk import encoding
+    from algosdk.future.transaction import PaymentTxn, SuggestedParams
+
+    from Encoder import aPayTemplate
+
+    addr = "VQIMXAPONHJV3W2HIQACCZWNUC5JIVWIFHRAV35ZH524M6NIZJXXHTLPJE"
+    sp = SuggestedParams(1000, 19939513, 19940513, "SGO1GKSzyE7IEPItTxCByw9x8FmnrCDexi9/cOUJOiI=", "testnet-v1.0", flat_fee=True)
+    start = time.perf_counter()
+    built = [base64.b64decode(encoding.msgpack_encode(PaymentTxn(addr, sp, addr, i, note="bench"))) for i in range(txns)]
+    sdk_done = time.perf_counter()
+    template = aPayTemplate(addr, sp, "bench")
+    encoded = [template.encode(addr, i) for i in range(txns)]
+    template_done = time.perf_counter()
+    return {
+        "txns": txns,
+        "sdk_per_second": txns / (sdk_done - start),
+        "template_per_second": txns / (template_done - sdk_done),
+        "identical": built == encoded}
+
+
+if __name__ == "__main__":
+    for module, ms in bench_imports().items():
+        print(f"{module:12} {ms:8.1f} ms")
+    print(check_concurrent_builders())
+    print(check_params_refresh())
+    print(bench_order_book())
+    print(bench_json_stream())
+    print(bench_export())
+    print(bench_encoder())
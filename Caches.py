@@ -0,0 +1,69 @@
+import threading
+from concurrent.futures import Future
+
+from algosdk.error import AlgodHTTPError
+
+
+class aCache:
+    """thread-safe memo of a loader function, shared across batch workers, each key is loaded once"""
+    def __init__(self, loader):
+        self.loader = loader
+        self.values = {}
+        self.loading = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        if key in self.values:
+            return self.values[key]
+        with self.lock:
+            if key in self.values:
+                return self.values[key]
+            future = self.loading.get(key)
+            owner = future is None
+            if owner:
+                future = self.loading[key] = Future()
+        if not owner:
+            # another worker is already fetching this key
+            return future.result()
+        try:
+            value = self.loader(key)
+        except BaseException as e:
+            with self.lock:
+                del self.loading[key]
+            future.set_exception(e)
+            raise
+        with self.lock:
+            self.values[key] = value
+            del self.loading[key]
+        future.set_result(value)
+        return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.values[key] = value
+
+    def discard(self, key):
+        with self.lock:
+            self.values.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.values.clear()
+
+
+def block_time_cache(indexer_client) -> aCache:
+    """round -> block timestamp"""
+    return aCache(lambda block: indexer_client.block_info(block)["timestamp"])
+
+def asset_params(algod_client, asset_id: int) -> dict:
+    """algod asset params, empty for deleted or unknown assets"""
+    try:
+        return algod_client.asset_info(asset_id).get("params", {})
+    except AlgodHTTPError as e:
+        if e.code == 404:
+            return {}
+        raise
+
+def asset_params_cache(algod_client) -> aCache:
+    """asset id -> algod asset params, empty for deleted assets"""
+    return aCache(lambda asset_id: asset_params(algod_client, asset_id))
@@ -0,0 +1,68 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from algosdk.util import microalgos_to_algos
+from algosdk.v2client.algod import AlgodClient
+from algosdk.v2client.indexer import IndexerClient
+
+from Caches import asset_params_cache, block_time_cache
+from Misc import find_amount_w_decimal, timestamp_to_string
+
+
+class aDashboard(AlgodClient, IndexerClient):
+    """account summaries for many addresses at once, fetched concurrently with shared caches"""
+    def __init__(self, algod_url: str, indexer_url: str, workers: int = 16):
+        self.algod_client = AlgodClient("", algod_url)
+        self.indexer_client = IndexerClient("", indexer_url)
+        self.workers = workers
+        self.block_times = block_time_cache(self.indexer_client)
+        self.asset_params = asset_params_cache(self.algod_client)
+
+    def account_summary(self, wallet_addr: str) -> dict:
+        """balance, account info and holdings of one address"""
+        algod_req = self.algod_client.account_info(wallet_addr)
+        indexer_req = self.indexer_client.account_info(wallet_addr).get("account", {})
+        summary = {}
+        summary["account"] = algod_req["address"]
+        summary["balance"] = str(microalgos_to_algos(algod_req["amount"]))
+        summary["min_balance"] = str(microalgos_to_algos(algod_req["min-balance"]))
+        summary["spend_balance"] = str(microalgos_to_algos(algod_req["amount"] - algod_req["min-balance"]))
+        summary["pending_rewards"] = algod_req["pending-rewards"]
+        summary["status"] = algod_req["status"]
+        summary["asset_count"] = algod_req["total-assets-opted-in"]
+        summary["app_count"] = algod_req["total-apps-opted-in"]
+        summary["created_asset_count"] = algod_req["total-created-assets"]
+        summary["created_app_count"] = algod_req["total-created-apps"]
+        summary["date_created"] = ""
+        summary["block_created"] = indexer_req.get("created-at-round", 0)
+        summary["is_deleted"] = indexer_req.get("deleted", False)
+        summary["type"] = indexer_req.get("sig-type", "")
+        if summary["block_created"]:
+            summary["date_created"] = timestamp_to_string(self.block_times.get(summary["block_created"]))
+        assets = []
+        for holding in algod_req.get("assets", []):
+            params = self.asset_params.get(holding["asset-id"])
+            assets.append({
+                "id": holding["asset-id"],
+                "name": params.get("name", ""),
+                "unit": params.get("unit-name", ""),
+                "decimal": params.get("decimals", 0),
+                "amount": find_amount_w_decimal(holding["amount"], params.get("decimals", 0)),
+                "is_frozen": holding["is-frozen"]})
+        summary["assets"] = assets
+        return summary
+
+    def iter_accounts(self, addresses: list):
+        """yield (address, summary) pairs as each lookup finishes, failed lookups carry an error key"""
+        unique = list(dict.fromkeys(addresses))
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(unique) or 1)) as pool:
+            futures = {pool.submit(self.account_summary, address): address for address in unique}
+            for future in as_completed(futures):
+                address = futures[future]
+                try:
+                    yield address, future.result()
+                except Exception as e:
+                    yield address, {"account": address, "error": str(e)}
+
+    def accounts(self, addresses: list) -> dict:
+        """address -> summary for every address in the book"""
+        return dict(self.iter_accounts(addresses))
@@ -0,0 +1,133 @@
+import base64
+from functools import lru_cache
+
+import msgpack
+from algosdk import account, encoding
+from nacl.signing import SigningKey
+
+from Hashing import sha512_256
+
+TXID_PREFIX = b"TX"
+GROUP_PREFIX = b"TG"
+MAX_GROUP_SIZE = 16
+
+
+def _pack(value) -> bytes:
+    return msgpack.packb(value, use_bin_type=True)
+
+def _fields(d: dict) -> bytes:
+    """key/value pairs already in canonical order, without the map header"""
+    return b"".join(_pack(key) + _pack(d[key]) for key in sorted(d) if d[key])
+
+def _map_header(size: int) -> bytes:
+    return bytes([0x80 | size]) if size < 16 else b"\xde" + size.to_bytes(2, "big")
+
+@lru_cache(maxsize=65536)
+def _receiver(address: str) -> bytes:
+    """packed 32 byte public key, empty for the zero address which canonical encoding omits"""
+    public_key = encoding.decode_address(address)
+    return _pack(public_key) if any(public_key) else b""
+
+
+class _Template:
+    """canonical msgpack of one transaction shape with the invariant fields encoded once.
+    the amount, receiver and group keys split the sorted invariant fields into runs, so a transaction is
+    the map header followed by the runs with the patched fields in between, zero or empty fields left out like the sdk does"""
+    amount_key = None
+    receiver_key = None
+
+    def __init__(self, sender_addr: str, sp, note=None, extra: dict = None):
+        if not sp.flat_fee:
+            raise ValueError("templates need flat fee params, the size based fee depends on every field")
+        if isinstance(note, str):
+            note = note.encode()
+        self.sender_addr = sender_addr
+        self.sp = sp
+        fixed = {"fee": sp.fee, "fv": sp.first, "gen": sp.gen, "gh": base64.b64decode(sp.gh), "lv": sp.last,
+            "note": note, "snd": encoding.decode_address(sender_addr)}
+        fixed.update(extra)
+        fixed = {key: value for key, value in fixed.items() if value}
+        self.fixed = len(fixed)
+        # slot order, e.g. pay sorts as amt, fee..gh, grp, lv, note, rcv, snd, type
+        self.slots = sorted((self.amount_key, self.receiver_key, "grp"))
+        bounds = [""] + self.slots + ["\uffff"]
+        self.runs = [_fields({key: value for key, value in fixed.items() if low < key < high})
+            for low, high in zip(bounds, bounds[1:])]
+        self.amount_prefix = _pack(self.amount_key)
+        self.receiver_prefix = _pack(self.receiver_key)
+
+    def encode(self, receiver: str, amount: int, group: bytes = None) -> bytes:
+        """canonical bytes of one transaction, identical to base64 decoding encoding.msgpack_encode(txn)"""
+        size = self.fixed
+        fields = {}
+        if amount:
+            fields[self.amount_key] = self.amount_prefix + _pack(amount)
+            size += 1
+        receiver_field = _receiver(receiver)
+        if receiver_field:
+            fields[self.receiver_key] = self.receiver_prefix + receiver_field
+            size += 1
+        if group:
+            fields["grp"] = b"\xa3grp" + _pack(group)
+            size += 1
+        runs = self.runs
+        slots = self.slots
+        return b"".join((_map_header(size), runs[0], fields.get(slots[0], b""), runs[1], fields.get(slots[1], b""),
+            runs[2], fields.get(slots[2], b""), runs[3]))
+
+    def encode_group(self, transfers: list) -> list:
+        """encode up to 16 (receiver, amount) transfers as one atomic group"""
+        if len(transfers) > MAX_GROUP_SIZE:
+            raise ValueError(f"a group holds at most {MAX_GROUP_SIZE} transactions")
+        gid = group_id([self.encode(receiver, amount) for receiver, amount in transfers])
+        return [self.encode(receiver, amount, gid) for receiver, amount in transfers]
+
+
+class aPayTemplate(_Template):
+    """algo payments from one sender with shared params and note"""
+    amount_key = "amt"
+    receiver_key = "rcv"
+
+    def __init__(self, sender_addr: str, sp, note=None):
+        super().__init__(sender_addr, sp, note, {"type": "pay"})
+
+
+class aAxferTemplate(_Template):
+    """asset transfers of one asset from one sender with shared params and note"""
+    amount_key = "aamt"
+    receiver_key = "arcv"
+
+    def __init__(self, sender_addr: str, sp, asset_id: int, note=None):
+        super().__init__(sender_addr, sp, note, {"type": "axfer", "xaid": asset_id})
+        self.asset_id = asset_id
+
+
+def raw_txid(encoded: bytes) -> bytes:
+    return sha512_256(TXID_PREFIX + encoded)
+
+def txid(encoded: bytes) -> str:
+    """transaction id of encoded transaction bytes"""
+    return base64.b32encode(raw_txid(encoded)).decode().strip("=")
+
+def group_id(encoded_txns: list) -> bytes:
+    """same as calculate_group_id, from encoded transaction bytes"""
+    return sha512_256(GROUP_PREFIX + _pack({"txlist": [raw_txid(encoded) for encoded in encoded_txns]}))
+
+
+class aSigner:
+    """signing key of one account, derived once and held only as long as the caller keeps the signer"""
+    def __init__(self, private_key: str):
+        self.signing_key = SigningKey(base64.b64decode(private_key)[:32])
+        self.address = account.address_from_private_key(private_key)
+
+    def sign(self, encoded: bytes, sender_addr: str = None) -> bytes:
+        """canonical signed transaction bytes, sender_addr adds the signer when signing for a rekeyed account"""
+        signature = self.signing_key.sign(TXID_PREFIX + encoded).signature
+        if sender_addr is not None and sender_addr != self.address:
+            return b"\x83\xa4sgnr" + _pack(encoding.decode_address(self.address)) + b"\xa3sig" + _pack(signature) + b"\xa3txn" + encoded
+        return b"\x82\xa3sig" + _pack(signature) + b"\xa3txn" + encoded
+
+
+def send_signed(algod_client, signed_txns: list) -> str:
+    """submit signed transaction bytes (one group) in a single request, returns the first txid"""
+    return algod_client.send_raw_transaction(base64.b64encode(b"".join(signed_txns)))
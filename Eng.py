@@ -1,7 +1,6 @@
 from typing import Union
 
 from algosdk import account
-from algosdk.constants import ZERO_ADDRESS
 from algosdk.future.transaction import (AssetCloseOutTxn, AssetDestroyTxn,
                                         AssetFreezeTxn, AssetOptInTxn,
                                         AssetTransferTxn, AssetUpdateTxn,
@@ -10,43 +9,85 @@ from algosdk.future.transaction import (AssetCloseOutTxn, AssetDestroyTxn,
 from algosdk.v2client.algod import AlgodClient
 from algosdk.v2client.indexer import IndexerClient
 
+from a_constants import ZERO_ADDRESS
+from Batch import aBatch
+from Caches import asset_params_cache
 from Misc import timestamp_to_string
+from Params import aParams
+from Planner import plan_opt_changes
+from Submit import aSubmitter
 
 
-class aEng(AlgodClient, IndexerClient):
+class aEng(aParams, aSubmitter, AlgodClient, IndexerClient):
     def __init__(self, algod_url: str, indexer_url: str, explorer_tx_url: str, txns_fee: int):
         self.algod_client = AlgodClient("", algod_url)
         self.indexer_client = IndexerClient("", indexer_url)
-        self.params = self.algod_client.suggested_params()
-        self.params.flat_fee = True
-        self.params.fee = txns_fee
+        self.txns_fee = txns_fee
         self.explorer_tx_url = explorer_tx_url
+        self.submit_queue = None # optional Submit.aSubmitQueue
+        self.validator = None # optional Validate.aGroupValidator
 
     def modify_fee(self, new_fee: int) -> bool:
         """modify the network fee for faster transaction time"""
         assert new_fee > 1000
-        self.params.fee = new_fee
+        self.set_fee(new_fee)
         return True
     
-    def merge_account(self, sender_addr: str, receiver_addr: str, fee_addr: str, fee_amount: int) -> dict:
+    def batch(self, sender_addr: str, eng_id: Union[int, None], fee_addr: str, pool_fees: bool = False, fee: int = None) -> aBatch:
+        """start a batch, pass it as batch= to group several operations with one asset interaction fee per group"""
+        sp = self.txn_params(fee)
+        return aBatch(sender_addr, sp, eng_id, fee_addr, fee_note="asset interaction fee", pool_fees=pool_fees)
+
+    def send_batch(self, batch: aBatch, sender_key: str) -> list:
+        """sign and submit every group of a batch"""
+        return batch.sign_and_send(sender_key, self.submitter, self.explorer_tx_url)
+
+    def merge_account(self, sender_addr: str, receiver_addr: str, fee_addr: str, fee_amount: int, fee: int = None) -> dict:
         """merge 2 accounts"""
-        return dict(PaymentTxn(sender_addr, self.params, fee_addr, fee_amount, receiver_addr).dictify())
+        sp = self.txn_params(fee)
+        return dict(PaymentTxn(sender_addr, sp, fee_addr, fee_amount, receiver_addr).dictify())
 
-    def delete_account(self, sender_addr: str, fee_addr: str, fee_amount: int) -> dict:
+    def delete_account(self, sender_addr: str, fee_addr: str, fee_amount: int, fee: int = None) -> dict:
         """delete account"""
-        return dict(PaymentTxn(sender_addr,self.params, fee_addr, fee_amount, ZERO_ADDRESS).dictify())
+        sp = self.txn_params(fee)
+        return dict(PaymentTxn(sender_addr,sp, fee_addr, fee_amount, ZERO_ADDRESS).dictify())
 
-    def rekey_account(self, sender_addr: str, receiver_addr: str, fee_addr: str, fee_amount: int) -> dict:
+    def rekey_account(self, sender_addr: str, receiver_addr: str, fee_addr: str, fee_amount: int, fee: int = None) -> dict:
         """change the private key of the sender address, to the receiver address"""
-        return dict(PaymentTxn(sender=sender_addr, sp=self.params, receiver=fee_addr, amt=fee_amount, rekey_to=receiver_addr).dictify())
+        sp = self.txn_params(fee)
+        return dict(PaymentTxn(sender=sender_addr, sp=sp, receiver=fee_addr, amt=fee_amount, rekey_to=receiver_addr).dictify())
 
-    def add_asset(self, sender_addr: str, asset_id: int) -> dict:
+    def add_asset(self, sender_addr: str, asset_id: int, fee: int = None) -> dict:
         """enable transacting with an asset"""
-        return dict(AssetOptInTxn(sender=sender_addr, sp=self.params, index=asset_id).dictify())
+        sp = self.txn_params(fee)
+        return dict(AssetOptInTxn(sender=sender_addr, sp=sp, index=asset_id).dictify())
     
-    def remove_asset(self, sender_addr: str, asset_id: int, receiver_addr: int) -> dict:
+    def remove_asset(self, sender_addr: str, asset_id: int, receiver_addr: int, fee: int = None) -> dict:
         """disable transacting with an asset"""
-        return dict(AssetCloseOutTxn(sender=sender_addr, sp=self.params, receiver=receiver_addr, index=asset_id).dictify())
+        sp = self.txn_params(fee)
+        return dict(AssetCloseOutTxn(sender=sender_addr, sp=sp, receiver=receiver_addr, index=asset_id).dictify())
+
+    def plan_assets(self, sender_addr: str, target_ids, eng_id: Union[int, None], fee_addr: str, fee_amount: int,
+        prune: bool = False, fee: int = None) -> dict:
+        """opt into every asset in target_ids (and close out the empty rest with prune) in as few groups as possible,
+        returns the plan with a ready-to-sign batch, or with batch None and the shortfall when the account can't afford it"""
+        sp = self.txn_params(fee)
+        plan = plan_opt_changes(self.algod_client.account_info(sender_addr), target_ids, sp.fee, fee_amount, eng_id, prune)
+        plan["batch"] = None
+        opt_out = plan.pop("opt_out_holdings")
+        if plan["shortfall"] > 0 or plan["fee_asset_shortfall"] > 0:
+            return plan
+        batch = self.batch(sender_addr, eng_id, fee_addr, fee=fee)
+        assets = asset_params_cache(self.algod_client)
+        for holding in opt_out:
+            asset_id = holding["asset-id"]
+            # the holding is empty, close to the creator which is always opted in, deleted assets have none
+            creator = holding.get("creator") or assets.get(asset_id).get("creator") or sender_addr
+            batch.add(AssetCloseOutTxn(sender=sender_addr, sp=sp, receiver=creator, index=asset_id), fee_amount)
+        for asset_id in plan["opt_in"]:
+            batch.add(AssetOptInTxn(sender=sender_addr, sp=sp, index=asset_id), fee_amount)
+        plan["batch"] = batch
+        return plan
     
     def created_assets(self, wallet_addr: str) -> list:
         """return a list of created assets"""
@@ -71,14 +112,17 @@ class aEng(AlgodClient, IndexerClient):
         return created_assets
     
     def freeze_asset(self, sender_addr: str, target_addr: str, asset_id: int,
-        eng_id: Union[int, None], fee_addr: str, fee_amount: int) -> dict:
+        eng_id: Union[int, None], fee_addr: str, fee_amount: int, batch: aBatch = None, fee: int = None) -> dict:
         """freeze an asset for a target_addr"""
+        sp = self.txn_params(fee)
 
-        txn1 = AssetFreezeTxn(sender=sender_addr, sp=self.params, index=asset_id, target=target_addr, new_freeze_state=True)
-        txn2 = PaymentTxn(sender_addr, self.params, fee_addr, fee_amount, note="asset interaction fee")
+        txn1 = AssetFreezeTxn(sender=sender_addr, sp=sp, index=asset_id, target=target_addr, new_freeze_state=True)
+        if batch is not None:
+            return batch.add(txn1, fee_amount)
+        txn2 = PaymentTxn(sender_addr, sp, fee_addr, fee_amount, note="asset interaction fee")
 
         if isinstance(eng_id, int):
-            txn2 = AssetTransferTxn(sender_addr, self.params, fee_addr, fee_amount, eng_id, note="asset interaction fee")
+            txn2 = AssetTransferTxn(sender_addr, sp, fee_addr, fee_amount, eng_id, note="asset interaction fee")
 
         gid = calculate_group_id([txn1, txn2])
         txn1.group = gid
@@ -89,7 +133,7 @@ class aEng(AlgodClient, IndexerClient):
         # stxn2 = txn2.sign(sender_key)
 
         # signed_group =  [stxn1, stxn2]
-        # txid = self.algod_client.send_transactions(signed_group)
+        # txid = self.submitter.send_transactions(signed_group)
 
         # transactioninfo = {}
         # transactioninfo['txid'] = txid
@@ -97,14 +141,17 @@ class aEng(AlgodClient, IndexerClient):
         # return transactioninfo   
 
     def unfreeze_asset(self, sender_key: str, target_addr: str, asset_id: int,
-        eng_id: Union[int, None], fee_addr: str, fee_amount: int) -> dict:
+        eng_id: Union[int, None], fee_addr: str, fee_amount: int, batch: aBatch = None, fee: int = None) -> dict:
         """unfreeze an asset for a target_address"""
+        sp = self.txn_params(fee)
     
-        txn1 = AssetFreezeTxn(sender=account.address_from_private_key(sender_key), sp=self.params, index=asset_id, target=target_addr, new_freeze_state=False)
-        txn2 = PaymentTxn(account.address_from_private_key(sender_key), self.params, fee_addr, fee_amount, note="asset interaction fee")
+        txn1 = AssetFreezeTxn(sender=account.address_from_private_key(sender_key), sp=sp, index=asset_id, target=target_addr, new_freeze_state=False)
+        if batch is not None:
+            return batch.add(txn1, fee_amount)
+        txn2 = PaymentTxn(account.address_from_private_key(sender_key), sp, fee_addr, fee_amount, note="asset interaction fee")
 
         if isinstance(eng_id, int):
-            txn2 = AssetTransferTxn(account.address_from_private_key(sender_key), self.params, fee_addr, fee_amount, eng_id, note="asset interaction fee")
+            txn2 = AssetTransferTxn(account.address_from_private_key(sender_key), sp, fee_addr, fee_amount, eng_id, note="asset interaction fee")
 
         gid = transaction.calculate_group_id([txn1, txn2])
         txn1.group = gid
@@ -116,7 +163,7 @@ class aEng(AlgodClient, IndexerClient):
         # stxn2 = txn2.sign(sender_key)
 
         # signed_group =  [stxn1, stxn2]
-        # txid = self.algod_client.send_transactions(signed_group)
+        # txid = self.submitter.send_transactions(signed_group)
 
         # transactioninfo = {}
         # transactioninfo['txid'] = txid
@@ -124,14 +171,17 @@ class aEng(AlgodClient, IndexerClient):
         # return transactioninfo    
     
     def clawback_asset(self, sender_key: str, receiver_addr: str, target_addr: str, asset_id: int, amount: int,
-        eng_id: Union[int, None], fee_addr: str, fee_amount: int) -> dict:
+        eng_id: Union[int, None], fee_addr: str, fee_amount: int, batch: aBatch = None, fee: int = None) -> dict:
         """retrieve an asset from an account and send it to a receiving address"""
+        sp = self.txn_params(fee)
 
-        txn1 = AssetTransferTxn(sender=account.address_from_private_key(sender_key), sp=self.params, receiver=receiver_addr, amt=amount, index=asset_id, revocation_target=target_addr)
-        txn2 = PaymentTxn(account.address_from_private_key(sender_key), self.params, fee_addr, fee_amount, note="asset interaction fee")
+        txn1 = AssetTransferTxn(sender=account.address_from_private_key(sender_key), sp=sp, receiver=receiver_addr, amt=amount, index=asset_id, revocation_target=target_addr)
+        if batch is not None:
+            return batch.add(txn1, fee_amount)
+        txn2 = PaymentTxn(account.address_from_private_key(sender_key), sp, fee_addr, fee_amount, note="asset interaction fee")
 
         if isinstance(eng_id, int):
-            txn2 = AssetTransferTxn(account.address_from_private_key(sender_key), self.params, fee_addr, fee_amount, eng_id, note="asset interaction fee")
+            txn2 = AssetTransferTxn(account.address_from_private_key(sender_key), sp, fee_addr, fee_amount, eng_id, note="asset interaction fee")
 
         gid = transaction.calculate_group_id([txn1, txn2])
         txn1.group = gid
@@ -141,7 +191,7 @@ class aEng(AlgodClient, IndexerClient):
         stxn2 = txn2.sign(sender_key)
 
         signed_group =  [stxn1, stxn2]
-        txid = self.algod_client.send_transactions(signed_group)
+        txid = self.submitter.send_transactions(signed_group)
 
         transactioninfo = {}
         transactioninfo['txid'] = txid
@@ -149,14 +199,17 @@ class aEng(AlgodClient, IndexerClient):
         return transactioninfo
     
     def destroy_asset(self, sender_key: str, asset_id: int, 
-        eng_id: Union[int, None], fee_addr: str, fee_amount: int) -> dict:
+        eng_id: Union[int, None], fee_addr: str, fee_amount: int, batch: aBatch = None, fee: int = None) -> dict:
         """destroy an asset"""
+        sp = self.txn_params(fee)
         
-        txn1 = AssetDestroyTxn(sender=account.address_from_private_key(sender_key), sp=self.params, index=asset_id)
-        txn2 = PaymentTxn(account.address_from_private_key(sender_key), self.params, fee_addr, fee_amount, note="asset interaction fee")
+        txn1 = AssetDestroyTxn(sender=account.address_from_private_key(sender_key), sp=sp, index=asset_id)
+        if batch is not None:
+            return batch.add(txn1, fee_amount)
+        txn2 = PaymentTxn(account.address_from_private_key(sender_key), sp, fee_addr, fee_amount, note="asset interaction fee")
         
         if isinstance(eng_id, int):
-            txn2 = AssetTransferTxn(account.address_from_private_key(sender_key), self.params, fee_addr, fee_amount, eng_id, note="asset interaction fee")
+            txn2 = AssetTransferTxn(account.address_from_private_key(sender_key), sp, fee_addr, fee_amount, eng_id, note="asset interaction fee")
 
         gid = transaction.calculate_group_id([txn1, txn2])
         txn1.group = gid
@@ -166,7 +219,7 @@ class aEng(AlgodClient, IndexerClient):
         stxn2 = txn2.sign(sender_key)
 
         signed_group =  [stxn1, stxn2]
-        txid = self.algod_client.send_transactions(signed_group)
+        txid = self.submitter.send_transactions(signed_group)
 
         transactioninfo = {}
         transactioninfo['txid'] = txid
@@ -174,14 +227,17 @@ class aEng(AlgodClient, IndexerClient):
         return transactioninfo
     
     def update_asset(self, sender_key: str, asset_id: int, manager_addr: str, freeze_addr: str, 
-        reserve_addr: str, clawback_addr: str, eng_id: Union[int, None], fee_addr: str, fee_amount: int) -> dict:
+        reserve_addr: str, clawback_addr: str, eng_id: Union[int, None], fee_addr: str, fee_amount: int, batch: aBatch = None, fee: int = None) -> dict:
         """modify the 4 primary addresses"""
+        sp = self.txn_params(fee)
         txn1 = AssetUpdateTxn(sender=account.address_from_private_key(sender_key),
-        sp=self.params, index=asset_id, manager=manager_addr, clawback=clawback_addr, freeze=freeze_addr, reserve=reserve_addr)
-        txn2 = PaymentTxn(account.address_from_private_key(sender_key), self.params, fee_addr, fee_amount, note="asset interaction fee")
+        sp=sp, index=asset_id, manager=manager_addr, clawback=clawback_addr, freeze=freeze_addr, reserve=reserve_addr)
+        if batch is not None:
+            return batch.add(txn1, fee_amount)
+        txn2 = PaymentTxn(account.address_from_private_key(sender_key), sp, fee_addr, fee_amount, note="asset interaction fee")
 
         if isinstance(eng_id, int):
-            txn2 = AssetTransferTxn(account.address_from_private_key(sender_key), self.params, fee_addr, fee_amount, eng_id, note="asset interaction fee")
+            txn2 = AssetTransferTxn(account.address_from_private_key(sender_key), sp, fee_addr, fee_amount, eng_id, note="asset interaction fee")
 
         gid = transaction.calculate_group_id([txn1, txn2])
         txn1.group = gid
@@ -191,7 +247,7 @@ class aEng(AlgodClient, IndexerClient):
         stxn2 = txn2.sign(sender_key)
 
         signed_group =  [stxn1, stxn2]
-        txid = self.algod_client.send_transactions(signed_group)
+        txid = self.submitter.send_transactions(signed_group)
 
         transactioninfo = {}
         transactioninfo['txid'] = txid
@@ -199,6 +255,50 @@ class aEng(AlgodClient, IndexerClient):
         return transactioninfo
 
 
+    @staticmethod
+    def _target_address(target) -> str:
+        """targets are addresses or holder snapshot rows"""
+        return target["address"] if isinstance(target, dict) else target
+
+    def _report(self, targets: list, batch: aBatch, sender_key: str, workers: int) -> list:
+        results = batch.send_concurrently(sender_key, self.submitter, self.explorer_tx_url, workers)
+        for target, result in zip(targets, results):
+            result["target"] = self._target_address(target)
+        return results
+
+    def bulk_freeze(self, sender_key: str, targets, asset_id: int, freeze_state: bool,
+        eng_id: Union[int, None], fee_addr: str, fee_amount: int, workers: int = 4, fee: int = None) -> list:
+        """freeze or unfreeze an asset for many addresses, 15 targets per group with one fee, returns a result per target"""
+        sp = self.txn_params(fee)
+        sender_addr = account.address_from_private_key(sender_key)
+        targets = list(targets)
+        batch = self.batch(sender_addr, eng_id, fee_addr, fee=fee)
+        for target in targets:
+            batch.add(AssetFreezeTxn(sender=sender_addr, sp=sp, index=asset_id,
+                target=self._target_address(target), new_freeze_state=freeze_state), fee_amount)
+        return self._report(targets, batch, sender_key, workers)
+
+    def bulk_unfreeze(self, sender_key: str, targets, asset_id: int,
+        eng_id: Union[int, None], fee_addr: str, fee_amount: int, workers: int = 4, fee: int = None) -> list:
+        """unfreeze an asset for many addresses"""
+        return self.bulk_freeze(sender_key, targets, asset_id, False, eng_id, fee_addr, fee_amount, workers, fee)
+
+    def bulk_clawback(self, sender_key: str, receiver_addr: str, targets, asset_id: int, amount: Union[int, None],
+        eng_id: Union[int, None], fee_addr: str, fee_amount: int, workers: int = 4, fee: int = None) -> list:
+        """claw an asset back from many addresses, amount None takes each snapshot row's full amount"""
+        sp = self.txn_params(fee)
+        sender_addr = account.address_from_private_key(sender_key)
+        targets = list(targets)
+        if amount is None and not all(isinstance(target, dict) for target in targets):
+            raise ValueError("amount None needs holder snapshot rows as targets, plain addresses carry no amount")
+        targets = [target for target in targets if amount is not None or target["amount"] > 0]
+        batch = self.batch(sender_addr, eng_id, fee_addr, fee=fee)
+        for target in targets:
+            batch.add(AssetTransferTxn(sender=sender_addr, sp=sp, receiver=receiver_addr,
+                amt=target["amount"] if amount is None else amount, index=asset_id,
+                revocation_target=self._target_address(target)), fee_amount)
+        return self._report(targets, batch, sender_key, workers)
+
 # add = "ZG6LER7OSSY33MJ22IQRHA2FKV2LLSZGOKF5VGBOE46NVF6FG7JDXVPHQA"
 # keyq = "eFXckqb03J7f0mGrkyYZrBI7Gp6BFQqFOVwoavKpSUXJvLJH7pSxvbE60iETg0VVdLXLJnKL2pguJzzal8U30g=="
 
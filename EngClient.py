@@ -1,7 +1,7 @@
-import json
-
 import requests
 
+from Stream import iter_response_items
+
 
 class MintEngineClient():
     def __init__(self, indexer_url: str):
@@ -18,19 +18,19 @@ class MintEngineClient():
         req = requests.get(f'{self.indexer_url}/assets/{asset_id}', params=query)
         return req.json()
 
-    def account_algo_transactions(self, account: str, limit: int):
+    def account_algo_transactions(self, account: str, limit: int, min_round: int = None, next_page: str = None):
         """returns an accounts algo transactions"""
-        params = {"tx-type": "pay", "limit": limit}
+        params = {"tx-type": "pay", "limit": limit, "min-round": min_round, "next": next_page}
         req = requests.get(f'{self.indexer_url}/accounts/{account}/transactions', params)
         return req.json()
 
-    def account_assets_transfer_transactions(self, account: str, limit: int):
-        params = {"tx-type": "axfer", "limit": limit}
+    def account_assets_transfer_transactions(self, account: str, limit: int, min_round: int = None, next_page: str = None):
+        params = {"tx-type": "axfer", "limit": limit, "min-round": min_round, "next": next_page}
         req = requests.get(f'{self.indexer_url}/accounts/{account}/transactions', params)
         return req.json()
 
-    def account_asset_transfer_transactions(self, account: str, asset_id: int, limit: int):
-        params = {"asset-id": asset_id, "tx-type": "axfer", "limit": limit}
+    def account_asset_transfer_transactions(self, account: str, asset_id: int, limit: int, min_round: int = None, next_page: str = None):
+        params = {"asset-id": asset_id, "tx-type": "axfer", "limit": limit, "min-round": min_round, "next": next_page}
         req = requests.get(f'{self.indexer_url}/accounts/{account}/transactions', params)
         return req.json()
 
@@ -38,9 +38,20 @@ class MintEngineClient():
         req = requests.get(f'{self.indexer_url}/blocks/{round_number}')
         return req.json()
 
-x = MintEngineClient("https://algoindexer.testnet.algoexplorerapi.io/v2")
-
-# g = [10458941, 16010077, 16001043, 16010043, 16010087, 17026402, 16010057, 16001041, 16010056, 16010085, 17063481, 16016011, 16010050, 16010049, 86121492]
-# for i in g:
-# print(json.dumps(x.asset_info(17063481), indent=2))
-# print(json.dumps(x.account_info("VQIMXAPONHJV3W2HIQACCZWNUC5JIVWIFHRAV35ZH524M6NIZJXXHTLPJE"), indent=2))
+    def iter_account_assets(self, account: str):
+        """streams an accounts asset holdings one at a time instead of loading the whole response"""
+        req = requests.get(f'{self.indexer_url}/accounts/{account}', stream=True)
+        return iter_response_items(req, ("account", "assets"))
+
+    def holding_in_address(self, account: str, asset_id: int) -> bool:
+        """check if an address is opted in to an asset, stops reading once the asset is found"""
+        assets = self.iter_account_assets(account)
+        try:
+            return any(asset["asset-id"] == asset_id for asset in assets)
+        finally:
+            assets.close()
+
+    def iter_block_transactions(self, round_number: int):
+        """streams the transactions of a block"""
+        req = requests.get(f'{self.indexer_url}/blocks/{round_number}', stream=True)
+        return iter_response_items(req, ("transactions",))
@@ -0,0 +1,169 @@
+import itertools
+import threading
+from urllib.error import URLError
+
+import msgpack
+from algosdk.encoding import encode_address
+from algosdk.error import AlgodHTTPError
+from algosdk.v2client.algod import AlgodClient
+
+from Submit import TRANSIENT_CODES
+
+# block transaction fields holding addresses and asset ids
+ADDRESS_FIELDS = ("snd", "rcv", "close", "arcv", "asnd", "aclose", "fadd")
+ASSET_FIELDS = ("xaid", "faid", "caid")
+
+
+class aEventBus(AlgodClient):
+    """follows new rounds once and pushes matching account and asset activity to subscribers"""
+    def __init__(self, algod_url: str, retry_delay: float = 1.0, max_retry_delay: float = 30.0):
+        self.algod_client = AlgodClient("", algod_url)
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.subscribers = {}
+        self.by_address = {}
+        self.by_asset = {}
+        self.last_round = None
+        self.thread = None
+        self.stopped = threading.Event()
+        self.error = None # the exception that ended the follower, None while it is healthy
+        self.last_network_error = None
+        self.subscriber_errors = {} # sub_id -> (round, exception) of the callback's last failure
+
+    def subscribe(self, callback=None, addresses=(), asset_ids=(), queue=None, loop=None) -> int:
+        """register a callback, or an asyncio queue with its loop, for activity on addresses and asset ids"""
+        if callback is None and queue is None:
+            raise ValueError("a subscriber needs a callback or a queue")
+        if queue is not None and loop is None:
+            raise ValueError("a queue subscriber needs the event loop that owns the queue")
+        if queue is not None:
+            callback = lambda event: loop.call_soon_threadsafe(queue.put_nowait, event)
+        with self.lock:
+            sub_id = next(self.ids)
+            self.subscribers[sub_id] = (callback, tuple(addresses), tuple(asset_ids))
+            for address in addresses:
+                self.by_address.setdefault(address, set()).add(sub_id)
+            for asset_id in asset_ids:
+                self.by_asset.setdefault(asset_id, set()).add(sub_id)
+        return sub_id
+
+    def unsubscribe(self, sub_id: int) -> bool:
+        with self.lock:
+            if sub_id not in self.subscribers:
+                return False
+            _, addresses, asset_ids = self.subscribers.pop(sub_id)
+            for address in addresses:
+                self.by_address[address].discard(sub_id)
+                if not self.by_address[address]:
+                    del self.by_address[address]
+            for asset_id in asset_ids:
+                self.by_asset[asset_id].discard(sub_id)
+                if not self.by_asset[asset_id]:
+                    del self.by_asset[asset_id]
+        return True
+
+    @staticmethod
+    def _event(round_number: int, timestamp: int, txn: dict) -> dict:
+        addresses = {field: encode_address(txn[field]) for field in ADDRESS_FIELDS if field in txn}
+        asset_id = next((txn[field] for field in ASSET_FIELDS if field in txn), 0)
+        return {
+            "round": round_number,
+            "timestamp": timestamp,
+            "tx_type": txn.get("type", ""),
+            "sender": addresses.get("asnd", addresses.get("snd", "")),
+            "receiver": addresses.get("rcv", addresses.get("arcv", addresses.get("fadd", ""))),
+            "close_to": addresses.get("close", addresses.get("aclose", "")),
+            "amount": txn.get("amt", txn.get("aamt", 0)),
+            "asset_id": asset_id,
+            "addresses": sorted(set(addresses.values()))}
+
+    @classmethod
+    def _txns(cls, stxn: dict):
+        """a block transaction followed by the inner transactions it issued, depth first"""
+        yield stxn["txn"]
+        for inner in stxn.get("dt", {}).get("itx", []):
+            yield from cls._txns(inner)
+
+    def match(self, event: dict) -> set:
+        """subscriber ids interested in an event"""
+        with self.lock:
+            matched = set()
+            for address in event["addresses"]:
+                matched |= self.by_address.get(address, set())
+            if event["asset_id"]:
+                matched |= self.by_asset.get(event["asset_id"], set())
+            return matched
+
+    def process_round(self, round_number: int) -> int:
+        """fetch one block and dispatch its matching transactions, returns the number of events pushed"""
+        raw = self.algod_client.block_info(round_number, response_format="msgpack")
+        block = msgpack.unpackb(raw, raw=False, strict_map_key=False)["block"]
+        pushed = 0
+        for stxn in block.get("txns", []):
+            if not self.subscribers:
+                break
+            # transfers made by applications are inner transactions of the application call
+            for txn in self._txns(stxn):
+                event = self._event(round_number, block.get("ts", 0), txn)
+                for sub_id in self.match(event):
+                    subscriber = self.subscribers.get(sub_id)
+                    if subscriber is None:
+                        continue
+                    # one failing subscriber must not stop delivery to the others
+                    try:
+                        subscriber[0](event)
+                    except Exception as e:
+                        self.subscriber_errors[sub_id] = (round_number, e)
+                        continue
+                    pushed += 1
+        self.last_round = round_number
+        return pushed
+
+    def run(self, start_round: int = None) -> None:
+        """follow the chain until stop() is called, network errors are retried with backoff from the same round,
+        anything else ends the follower and is kept in error"""
+        self.error = None
+        next_round = start_round
+        delay = self.retry_delay
+        try:
+            while not self.stopped.is_set():
+                try:
+                    if next_round is None:
+                        next_round = self.algod_client.status()["last-round"]
+                    status = self.algod_client.status_after_block(next_round - 1)
+                    while next_round <= status["last-round"] and not self.stopped.is_set():
+                        self.process_round(next_round)
+                        next_round += 1
+                    delay = self.retry_delay
+                except AlgodHTTPError as e:
+                    if e.code not in TRANSIENT_CODES:
+                        raise
+                    self.last_network_error = e
+                except (URLError, TimeoutError, ConnectionError) as e:
+                    self.last_network_error = e
+                else:
+                    continue
+                self.stopped.wait(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+        except Exception as e:
+            self.error = e
+            raise
+
+    @property
+    def running(self) -> bool:
+        """True while the background follower is alive"""
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, start_round: int = None) -> None:
+        """follow the chain on a background thread"""
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, args=(start_round,), daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
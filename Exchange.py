@@ -0,0 +1,162 @@
+import heapq
+import itertools
+from typing import Union
+
+from algosdk.future.transaction import (AssetTransferTxn, PaymentTxn,
+                                        calculate_group_id)
+
+from Batch import fee_txn
+
+BUY = "buy"
+SELL = "sell"
+
+
+class Order:
+    """a limit order, price is in quote base units per price_scale base units of the base asset"""
+    __slots__ = ("order_id", "owner", "side", "price", "amount", "remaining", "seq", "active")
+
+    def __init__(self, order_id: int, owner: str, side: str, price: int, amount: int, seq: int):
+        self.order_id = order_id
+        self.owner = owner
+        self.side = side
+        self.price = price
+        self.amount = amount
+        self.remaining = amount
+        self.seq = seq
+        self.active = True
+
+
+class Trade:
+    __slots__ = ("buyer", "seller", "price", "amount", "price_scale", "buy_order_id", "sell_order_id")
+
+    def __init__(self, buy: Order, sell: Order, price: int, amount: int, price_scale: int = 1):
+        self.buyer = buy.owner
+        self.seller = sell.owner
+        self.price = price
+        self.amount = amount
+        self.price_scale = price_scale
+        self.buy_order_id = buy.order_id
+        self.sell_order_id = sell.order_id
+
+    @property
+    def quote_amount(self) -> int:
+        """exact, amounts are whole multiples of price_scale"""
+        return self.price * self.amount // self.price_scale
+
+
+class aOrderBook:
+    """price-time priority order book for one asset pair, asset id 0 is algo.
+    prices are whole quote base units per price_scale base units, e.g. price_scale 10**6 quotes a 6 decimal asset
+    per whole token, so it can trade below one quote base unit per base unit. amounts are then whole multiples of it"""
+    def __init__(self, base_asset_id: int, quote_asset_id: int, price_scale: int = 1):
+        if price_scale <= 0:
+            raise ValueError("price_scale must be positive")
+        self.base_asset_id = base_asset_id
+        self.quote_asset_id = quote_asset_id
+        self.price_scale = price_scale
+        self.bids = []
+        self.asks = []
+        self.orders = {}
+        self.ids = itertools.count(1)
+        self.stale = 0
+
+    def place(self, owner: str, side: str, price: int, amount: int) -> int:
+        """add a limit order, O(log n), returns the order id"""
+        if side not in (BUY, SELL):
+            raise ValueError(f"unknown side: {side}")
+        if price <= 0 or amount <= 0:
+            raise ValueError("price and amount must be positive")
+        if amount % self.price_scale:
+            raise ValueError(f"amount must be a multiple of price_scale ({self.price_scale})")
+        order_id = next(self.ids)
+        order = Order(order_id, owner, side, price, amount, order_id)
+        self.orders[order_id] = order
+        if side == BUY:
+            heapq.heappush(self.bids, (-price, order_id, order))
+        else:
+            heapq.heappush(self.asks, (price, order_id, order))
+        return order_id
+
+    def cancel(self, order_id: int) -> bool:
+        """cancel an open order, heap entries are dropped lazily when they reach the top"""
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            return False
+        order.active = False
+        self.stale += 1
+        if self.stale > len(self.orders):
+            self._compact()
+        return True
+
+    def _compact(self) -> None:
+        self.bids = [entry for entry in self.bids if entry[2].active]
+        self.asks = [entry for entry in self.asks if entry[2].active]
+        heapq.heapify(self.bids)
+        heapq.heapify(self.asks)
+        self.stale = 0
+
+    @staticmethod
+    def _top(heap: list) -> Union[Order, None]:
+        while heap and not heap[0][2].active:
+            heapq.heappop(heap)
+        return heap[0][2] if heap else None
+
+    def best_bid(self) -> Union[Order, None]:
+        return self._top(self.bids)
+
+    def best_ask(self) -> Union[Order, None]:
+        return self._top(self.asks)
+
+    def _close(self, heap: list, order: Order) -> None:
+        heapq.heappop(heap)
+        order.active = False
+        del self.orders[order.order_id]
+
+    def match(self, max_trades: int = None) -> list:
+        """match every crossing order, trades execute at the resting (earlier) order's price"""
+        trades = []
+        while max_trades is None or len(trades) < max_trades:
+            bid = self._top(self.bids)
+            ask = self._top(self.asks)
+            if bid is None or ask is None or bid.price < ask.price:
+                break
+            amount = min(bid.remaining, ask.remaining)
+            price = bid.price if bid.seq < ask.seq else ask.price
+            trades.append(Trade(bid, ask, price, amount, self.price_scale))
+            bid.remaining -= amount
+            ask.remaining -= amount
+            if bid.remaining == 0:
+                self._close(self.bids, bid)
+            if ask.remaining == 0:
+                self._close(self.asks, ask)
+        return trades
+
+    def depth(self, levels: int = 10) -> dict:
+        """aggregated open amount per price level on each side"""
+        book = {}
+        for side, heap, sign in ((BUY, self.bids, -1), (SELL, self.asks, 1)):
+            totals = {}
+            for _, _, order in heap:
+                if order.active:
+                    totals[order.price] = totals.get(order.price, 0) + order.remaining
+            book[side] = sorted(totals.items(), key=lambda level: sign * level[0])[:levels]
+        return book
+
+    @staticmethod
+    def _leg(asset_id: int, sender_addr: str, sp, receiver_addr: str, amount: int):
+        if asset_id == 0:
+            return PaymentTxn(sender_addr, sp, receiver_addr, amount, note="exchange swap")
+        return AssetTransferTxn(sender_addr, sp, receiver_addr, amount, asset_id, note="exchange swap")
+
+    def swap_group(self, trade: Trade, sp, eng_id: Union[int, None] = None, fee_addr: str = None, fee_amount: int = 0) -> list:
+        """atomic swap for a trade: base asset seller -> buyer, quote buyer -> seller, plus a fee from each side"""
+        base = self._leg(self.base_asset_id, trade.seller, sp, trade.buyer, trade.amount)
+        quote = self._leg(self.quote_asset_id, trade.buyer, sp, trade.seller, trade.quote_amount)
+        txns = [base, quote]
+        if fee_addr and fee_amount > 0:
+            txns.append(fee_txn(trade.seller, sp, eng_id, fee_addr, fee_amount, "exchange fee"))
+            txns.append(fee_txn(trade.buyer, sp, eng_id, fee_addr, fee_amount, "exchange fee"))
+        gid = calculate_group_id(txns)
+        for txn in txns:
+            txn.group = gid
+        return txns
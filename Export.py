@@ -0,0 +1,54 @@
+import base64
+
+import msgpack
+from algosdk.encoding import future_msgpack_decode
+
+
+def _canonical(d: dict) -> dict:
+    """sorted keys and no zero values at every level, as algod expects"""
+    out = {}
+    for key in sorted(d):
+        value = d[key]
+        if isinstance(value, dict):
+            out[key] = _canonical(value)
+        elif value:
+            out[key] = value
+    return out
+
+def _as_dict(txn) -> dict:
+    """accepts the dicts returned by the builders or sdk transaction objects"""
+    if isinstance(txn, dict):
+        return txn
+    return txn.dictify()
+
+def _as_groups(txns) -> list:
+    """a flat list of transactions is treated as one transaction per group"""
+    return [group if isinstance(group, (list, tuple)) else [group] for group in txns]
+
+def export_unsigned(txns, b64: bool = False) -> bytes:
+    """encode many unsigned transactions or groups as one canonical msgpack buffer, an array of groups.
+    smaller than json of base64 strings, encoding costs about the same since dictify dominates"""
+    packed = msgpack.packb([[_canonical(_as_dict(txn)) for txn in group] for group in _as_groups(txns)], use_bin_type=True)
+    if b64:
+        return base64.b64encode(packed)
+    return packed
+
+def _unpack(buffer, b64: bool) -> list:
+    if b64:
+        buffer = base64.b64decode(buffer)
+    return msgpack.unpackb(buffer, raw=False)
+
+def import_unsigned(buffer, b64: bool = False) -> list:
+    """decode a buffer from export_unsigned back into groups of transaction objects"""
+    return [[future_msgpack_decode(txn) for txn in group] for group in _unpack(buffer, b64)]
+
+def import_signed(buffer, b64: bool = False) -> list:
+    """decode groups of signed (or multisig/logicsig signed) transactions returned by the wallet front end"""
+    return [[future_msgpack_decode(stxn) for stxn in group] for group in _unpack(buffer, b64)]
+
+def export_signed(signed_groups, b64: bool = False) -> bytes:
+    """encode groups of signed transactions in the same framing, e.g. for the front end or tests"""
+    packed = msgpack.packb([[_canonical(stxn.dictify()) for stxn in group] for group in _as_groups(signed_groups)], use_bin_type=True)
+    if b64:
+        return base64.b64encode(packed)
+    return packed
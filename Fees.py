@@ -0,0 +1,98 @@
+import threading
+import time
+from collections import deque
+
+import msgpack
+from algosdk.v2client.algod import AlgodClient
+
+MIN_FEE = 1000
+
+
+class aFeeEstimator(AlgodClient):
+    """rolling model of the flat fee needed to land within N rounds, from recent blocks and pending pool depth"""
+    def __init__(self, algod_url: str, window: int = 20, block_capacity: int = None, refresh_seconds: float = 4.0):
+        self.algod_client = AlgodClient("", algod_url)
+        self.window = window
+        self.block_capacity = block_capacity
+        self.refresh_seconds = refresh_seconds
+        self.blocks = deque(maxlen=window)
+        self.pending = 0
+        self.min_fee = MIN_FEE
+        self.last_sample = 0.0
+        self.lock = threading.Lock()
+        self.sample_lock = threading.Lock()
+        self.refreshing = False
+
+    def _block_fees(self, round_number: int) -> tuple:
+        raw = self.algod_client.block_info(round_number, response_format="msgpack")
+        txns = msgpack.unpackb(raw, raw=False, strict_map_key=False)["block"].get("txns", [])
+        return round_number, len(txns), sorted(stxn["txn"].get("fee", 0) for stxn in txns)
+
+    def _sample(self) -> None:
+        last_round = self.algod_client.status()["last-round"]
+        with self.lock:
+            seen = self.blocks[-1][0] if self.blocks else 0
+        first = max(last_round - self.window + 1, seen + 1, 1)
+        fetched = [self._block_fees(round_number) for round_number in range(first, last_round + 1)]
+        pending = self.algod_client.pending_transactions(max_txns=1).get("total-transactions", 0)
+        min_fee = self.algod_client.suggested_params().min_fee or MIN_FEE
+        with self.lock:
+            self.blocks.extend(fetched)
+            self.pending = pending
+            self.min_fee = min_fee
+            self.last_sample = time.monotonic()
+
+    def sample(self) -> None:
+        """pull blocks since the last sample and the current pending pool depth, one sample runs at a time"""
+        with self.sample_lock:
+            self._sample()
+
+    def _refresh(self) -> None:
+        try:
+            self.sample()
+        finally:
+            with self.lock:
+                self.refreshing = False
+
+    def _ensure_fresh(self) -> None:
+        """the first call samples, after that a stale model is refreshed by one background thread while callers keep
+        reading the last estimate"""
+        if not self.last_sample:
+            with self.sample_lock:
+                if not self.last_sample:
+                    self._sample()
+            return
+        if time.monotonic() - self.last_sample <= self.refresh_seconds:
+            return
+        with self.lock:
+            if self.refreshing:
+                return
+            self.refreshing = True
+        threading.Thread(target=self._refresh, daemon=True).start()
+
+    def capacity(self) -> int:
+        """transactions per block, configured or the busiest block seen"""
+        if self.block_capacity:
+            return self.block_capacity
+        return max((count for _, count, _ in self.blocks), default=0) or 1
+
+    def fee(self, within_rounds: int = 1) -> int:
+        """flat fee expected to confirm within the given number of rounds"""
+        self._ensure_fresh()
+        with self.lock:
+            room = self.capacity() * within_rounds
+            if self.pending < room:
+                return self.min_fee
+            fees = sorted(fee for _, _, block_fees in self.blocks for fee in block_fees)
+            if not fees:
+                return self.min_fee
+            # outbid everything but the share of the pending pool that fits in the window
+            rank = min(len(fees) - 1, int(len(fees) * (1 - room / self.pending)))
+            return max(self.min_fee, fees[rank] + 1)
+
+    def levels(self) -> dict:
+        """fee levels for common latency targets"""
+        return {
+            "next_round": self.fee(1),
+            "within_3_rounds": self.fee(3),
+            "within_10_rounds": self.fee(10)}
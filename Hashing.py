@@ -0,0 +1,75 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+CHUNK_SIZE = 1 << 20
+
+
+def new_hasher(algorithm: str = "sha512_256"):
+    """return a hash object for sha256 or sha512_256"""
+    if algorithm == "sha256":
+        return hashlib.sha256()
+    if algorithm != "sha512_256":
+        raise ValueError(f"unsupported hash algorithm: {algorithm}")
+    try:
+        return hashlib.new("sha512_256")
+    except ValueError:
+        # openssl builds without sha512/256, pycryptodomex ships with the sdk
+        from Cryptodome.Hash import SHA512
+        return SHA512.new(truncate="256")
+
+def sha512_256(data: bytes) -> bytes:
+    """SHA-512/256 digest of some bytes"""
+    h = new_hasher("sha512_256")
+    h.update(data)
+    return h.digest()
+
+def hash_file(path: str, algorithm: str = "sha512_256", chunk_size: int = CHUNK_SIZE) -> bytes:
+    """hash a file in fixed-size chunks, memory use does not grow with the file"""
+    h = new_hasher(algorithm)
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(path, "rb") as f:
+        while True:
+            size = f.readinto(buffer)
+            if not size:
+                break
+            h.update(view[:size])
+    return h.digest()
+
+def _hash_job(job: tuple) -> bytes:
+    return hash_file(*job)
+
+def hash_files(paths: list, algorithm: str = "sha512_256", workers: int = None) -> dict:
+    """hash many files in parallel across processes, returns path -> digest"""
+    paths = list(paths)
+    if len(paths) < 2 or workers == 1:
+        return {path: hash_file(path, algorithm) for path in paths}
+    jobs = [(path, algorithm) for path in paths]
+    chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(paths, pool.map(_hash_job, jobs, chunksize=chunksize)))
+
+def hash_directory(directory: str, algorithm: str = "sha512_256", workers: int = None) -> dict:
+    """hash every file under a directory, returns a manifest of relative path -> hex digest"""
+    paths = []
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            paths.append(os.path.join(root, name))
+    digests = hash_files(paths, algorithm, workers)
+    return {
+        "algorithm": algorithm,
+        "files": {os.path.relpath(path, directory).replace(os.sep, "/"): digest.hex() for path, digest in digests.items()}}
+
+def write_manifest(manifest: dict, path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+def load_manifest(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+def manifest_hash(manifest: dict, relpath: str) -> bytes:
+    """32 byte digest of a manifest entry, ready to pass as an asset metadata hash"""
+    return bytes.fromhex(manifest["files"][relpath])
@@ -0,0 +1,83 @@
+import json
+import sqlite3
+import threading
+
+from algosdk.v2client.indexer import IndexerClient
+
+from Misc import iter_account_transactions
+
+
+class aHistoryCache:
+    """persistent per (address, txn type, asset) transaction history, refreshed from the last confirmed round seen"""
+    def __init__(self, path: str = "history.db"):
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        with self.db:
+            self.db.execute("""CREATE TABLE IF NOT EXISTS marks (
+                address TEXT, txn_type TEXT, asset_id INTEGER, round INTEGER,
+                PRIMARY KEY (address, txn_type, asset_id))""")
+            self.db.execute("""CREATE TABLE IF NOT EXISTS transactions (
+                address TEXT, txn_type TEXT, asset_id INTEGER, txid TEXT, round INTEGER, body TEXT,
+                PRIMARY KEY (address, txn_type, asset_id, txid))""")
+
+    def high_water_mark(self, address: str, txn_type: str, asset_id: int = None) -> int:
+        """highest confirmed round stored for the key, 0 when nothing is stored"""
+        with self.lock:
+            row = self.db.execute("SELECT round FROM marks WHERE address=? AND txn_type=? AND asset_id=?",
+                (address, txn_type, asset_id or 0)).fetchone()
+        return row[0] if row else 0
+
+    def merge(self, address: str, txn_type: str, asset_id: int, transactions: list) -> int:
+        """store new transactions and raise the high-water mark, returns the number of new rows"""
+        asset_id = asset_id or 0
+        rows = [(address, txn_type, asset_id, txn["id"], txn.get("confirmed-round", 0), json.dumps(txn))
+            for txn in transactions]
+        if not rows:
+            return 0
+        mark = max(row[4] for row in rows)
+        with self.lock, self.db:
+            before = self.db.total_changes
+            self.db.executemany("INSERT OR IGNORE INTO transactions VALUES (?, ?, ?, ?, ?, ?)", rows)
+            added = self.db.total_changes - before
+            self.db.execute("""INSERT INTO marks VALUES (?, ?, ?, ?)
+                ON CONFLICT (address, txn_type, asset_id) DO UPDATE SET round=max(round, excluded.round)""",
+                (address, txn_type, asset_id, mark))
+        return added
+
+    def transactions(self, address: str, txn_type: str, asset_id: int = None, limit: int = None) -> list:
+        """stored transactions, newest first like the indexer"""
+        query = "SELECT body FROM transactions WHERE address=? AND txn_type=? AND asset_id=? ORDER BY round DESC, txid"
+        params = (address, txn_type, asset_id or 0)
+        if limit:
+            query += " LIMIT ?"
+            params += (limit,)
+        with self.lock:
+            rows = self.db.execute(query, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def sync(self, address: str, txn_type: str, fetch, asset_id: int = None, limit: int = None) -> list:
+        """fetch(min_round, next_page) returns an indexer style response, only rounds above the mark are requested.
+        pages come newest first, so nothing is stored until the last page is in, a failed page leaves the mark where it was"""
+        min_round = self.high_water_mark(address, txn_type, asset_id) + 1
+        transactions = []
+        next_page = None
+        while True:
+            response = fetch(min_round, next_page)
+            transactions.extend(response.get("transactions", []))
+            next_page = response.get("next-token")
+            if not next_page or not response.get("transactions"):
+                break
+        self.merge(address, txn_type, asset_id, transactions)
+        return self.transactions(address, txn_type, asset_id, limit)
+
+    def sync_indexer(self, client: IndexerClient, address: str, txn_type: str, asset_id: int = None, limit: int = None) -> list:
+        """refresh the history of an address through an algosdk indexer client.
+        the first sync of a key pages the whole history whatever the limit, later syncs only fetch new rounds"""
+        min_round = self.high_water_mark(address, txn_type, asset_id) + 1
+        self.merge(address, txn_type, asset_id,
+            list(iter_account_transactions(client, address, txn_type=txn_type, asset_id=asset_id, min_round=min_round)))
+        return self.transactions(address, txn_type, asset_id, limit)
+
+    def close(self):
+        with self.lock:
+            self.db.close()
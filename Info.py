@@ -1,18 +1,19 @@
 import base64
 
-import requests
 from algosdk.util import microalgos_to_algos
 from algosdk.v2client.algod import AlgodClient
 from algosdk.v2client.indexer import IndexerClient
 
 from Misc import (find_amount_w_decimal, find_amount_w_decimal_id,
                   timestamp_to_string)
+from Records import AxferRecord, PayRecord
 
 
 class aInfo(AlgodClient, IndexerClient):
     def __init__(self, indexer_url: str, algod_url: str):
         self.indexer_client = IndexerClient("", indexer_url)
         self.algod_client = AlgodClient("", algod_url)
+        self.supply_cache = None # optional Supply.aSupplyCache, replaces the vestige supply figures
     
     def get_account_info(self, wallet_addr: str) -> dict:
         """return information on an account"""
@@ -39,9 +40,12 @@ class aInfo(AlgodClient, IndexerClient):
         
     def get_asset_info(self, asset_id: int) -> dict:
         """return information on an asset"""
+        import requests
         asset_info = {}
         price_info = requests.get(f"https://free-api.vestige.fi/asset/{asset_id}/price").json()
-        supply_info = requests.get(f"https://free-api.vestige.fi/asset/{asset_id}").json()
+        supply_info = {}
+        if self.supply_cache is None:
+            supply_info = requests.get(f"https://free-api.vestige.fi/asset/{asset_id}").json()
         describe = requests.get(f"https://indexer.algoexplorerapi.io/v2/assets/{asset_id}?include-all=true").json()
         req = self.indexer_client.asset_info(asset_id)
         if "asset" in req:
@@ -73,6 +77,12 @@ class aInfo(AlgodClient, IndexerClient):
                 asset_info["market_cap"] = asset_info["circulating_supply"] * asset_info["price"]
             if isinstance(supply_info, dict) and "burned_supply" in supply_info:
                 asset_info["burned_supply"] = find_amount_w_decimal(int(supply_info["burned_supply"]), supply_info["decimals"])
+            if self.supply_cache is not None:
+                supply = self.supply_cache.get(asset_id)
+                decimals = req["asset"]["params"]["decimals"]
+                asset_info["circulating_supply"] = find_amount_w_decimal(supply.circulating(), decimals)
+                asset_info["burned_supply"] = find_amount_w_decimal(supply.burned(), decimals)
+                asset_info["market_cap"] = asset_info["circulating_supply"] * asset_info["price"]
             if isinstance(describe, dict) and "asset" in describe and "verification" in describe["asset"] and "description" in describe["asset"]["verification"]:
                 asset_info["description"] = describe["asset"]["verification"]["description"]
         return asset_info
@@ -82,22 +92,25 @@ class aInfo(AlgodClient, IndexerClient):
         txn_info = {}
         req = self.indexer_client.transaction(txid)
         if "transaction" in req:
-            txn_info["sender"] = req["transaction"]["sender"]
-            if "payment-transaction" in req["transaction"]:
-                txn_info["receiver"] = req["transaction"]["payment-transaction"]["receiver"]
-                txn_info["amount"] =str(microalgos_to_algos(req["transaction"]["payment-transaction"]["amount"]))
+            transaction = req["transaction"]
+            txn_info["sender"] = transaction["sender"]
+            if "payment-transaction" in transaction:
+                record = PayRecord.from_indexer(transaction)
+                txn_info["receiver"] = record.receiver
+                txn_info["amount"] = str(microalgos_to_algos(record.amount))
                 txn_info["asset_id"] = 0
                 txn_info["name"] = "ALGO"
-            if "asset-transfer-transaction" in req["transaction"]:
-                txn_info["receiver"] = req["transaction"]["asset-transfer-transaction"]["receiver"]
-                txn_info["amount"] = find_amount_w_decimal_id(self.indexer_client, req["transaction"]["asset-transfer-transaction"]["amount"], req["transaction"]["asset-transfer-transaction"]["asset-id"])
-                txn_info["asset_id"] = req["transaction"]["asset-transfer-transaction"]["asset-id"]
-                txn_info["name"] = self.get_asset_info(req["transaction"]["asset-transfer-transaction"]["asset-id"])["name"]
-            txn_info["timestamp"] = timestamp_to_string(req["transaction"]["round-time"])
-            txn_info["txid"] = req["transaction"]["id"]
-            txn_info["tx_type"] = req["transaction"]["tx-type"]
-            txn_info["fee"] = str(microalgos_to_algos(req["transaction"]["fee"]))
+            if "asset-transfer-transaction" in transaction:
+                record = AxferRecord.from_indexer(transaction)
+                txn_info["receiver"] = record.receiver
+                txn_info["amount"] = find_amount_w_decimal_id(self.indexer_client, record.amount, record.asset_id)
+                txn_info["asset_id"] = record.asset_id
+                txn_info["name"] = self.get_asset_info(record.asset_id)["name"]
+            txn_info["timestamp"] = timestamp_to_string(transaction["round-time"])
+            txn_info["txid"] = transaction["id"]
+            txn_info["tx_type"] = transaction["tx-type"]
+            txn_info["fee"] = str(microalgos_to_algos(transaction["fee"]))
             txn_info["note"] = ""
-            if "note" in req["transaction"]:
-                txn_info["note"] = base64.b64decode(req['transaction']['note']).decode()
+            if "note" in transaction:
+                txn_info["note"] = base64.b64decode(transaction['note']).decode()
         return txn_info
@@ -2,12 +2,14 @@ import base64
 import hashlib
 from datetime import datetime
 
-import requests
 from algosdk.encoding import is_valid_address
 from algosdk.v2client.indexer import IndexerClient
 
+from Hashing import hash_file
+
 
 def get_token_price(asset_id: int):
+    import requests
     price = 0
     price_info = requests.get(f"https://free-api.vestige.fi/asset/{asset_id}/price").json()
     if isinstance(price_info, dict) and "USD" in price_info:
@@ -48,12 +50,9 @@ def timestamp_to_string(timestamp: int) -> str:
     date_time = dt_obj.strftime("%d-%m-%Y, %H:%M:%S")
     return date_time
 
-def meta_hash_file_data(filename: str) -> bytes:
-    """Takes any byte data and returns the SHA512/256 hash in base64. in summary: hashes a file"""
-    filebytes = open(filename, 'rb').read()
-    h = hashlib.sha256()
-    h.update(filebytes)
-    return h.digest()
+def meta_hash_file_data(filename: str, algorithm: str = "sha256") -> bytes:
+    """Takes any byte data and returns the SHA256 (or SHA512/256) digest. in summary: hashes a file"""
+    return hash_file(filename, algorithm)
 
 def meta_hash_text(string: str) -> bytes:
     """ Takes any byte data and returns the SHA512/256 hash in base64. in summary: hashes a text """
@@ -216,6 +215,36 @@ def r_nft_holding_address(client: IndexerClient, asset_id: int) -> dict:
             holder["amount"] = balance["amount"]
     return holder
 
+def iter_asset_holders(client: IndexerClient, asset_id: int, min_amount: int = 0,
+    include_zero: bool = True, page_size: int = 1000):
+    """lazily yield every holder of an asset, one indexer page at a time"""
+    next_page = None
+    # the indexer filter is exclusive, so ask for balances above min_amount - 1. the sdk drops a falsy
+    # min_balance, so for min_amount 1 the filter is not sent and the amount is checked here as well
+    min_balance = min_amount - 1 if min_amount > 0 else None
+    while True:
+        info = client.asset_balances(asset_id=asset_id, limit=page_size, next_page=next_page, min_balance=min_balance)
+        for balance in info.get("balances", []):
+            if balance["amount"] < min_amount or (not include_zero and balance["amount"] == 0):
+                continue
+            yield balance
+        next_page = info.get("next-token")
+        if not next_page or not info.get("balances"):
+            break
+
+def iter_account_transactions(client: IndexerClient, wallet_addr: str, txn_type: str = None,
+    asset_id: int = None, min_round: int = None, page_size: int = 1000):
+    """lazily yield every transaction of an account, one indexer page at a time"""
+    next_page = None
+    while True:
+        response = client.search_transactions_by_address(address=wallet_addr, limit=page_size, next_page=next_page,
+            txn_type=txn_type, asset_id=asset_id, min_round=min_round)
+        for transaction in response.get("transactions", []):
+            yield transaction
+        next_page = response.get("next-token")
+        if not next_page or not response.get("transactions"):
+            break
+
 def transaction_successful(client: IndexerClient, txid: str) -> str:
     """check if a transaction was successful"""
     response = client.transaction(txid)
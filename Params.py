@@ -0,0 +1,61 @@
+import threading
+import time
+from copy import copy
+
+_params_lock = threading.Lock()
+
+
+class aParams:
+    """suggested params fetched on first use instead of in the constructor and again once older than
+    params_max_age seconds, so a long lived object keeps building transactions inside their validity window.
+    expects algod_client and txns_fee. the shared params object is never mutated once published, so builders
+    can run on many threads"""
+    _params = None
+    _params_fetched = 0.0
+    params_max_age = 60.0 # seconds, None keeps the first params
+    fee_estimator = None # optional Fees.aFeeEstimator, used when a call does not pass a fee
+    target_rounds = 1
+
+    def _params_stale(self) -> bool:
+        if self._params is None:
+            return True
+        return self.params_max_age is not None and time.monotonic() - self._params_fetched > self.params_max_age
+
+    @property
+    def params(self):
+        if self._params_stale():
+            with _params_lock:
+                if self._params_stale():
+                    params = self.algod_client.suggested_params()
+                    params.flat_fee = True
+                    params.fee = self.txns_fee
+                    self._params_fetched = time.monotonic()
+                    self._params = params
+        return self._params
+
+    @params.setter
+    def params(self, params):
+        with _params_lock:
+            self._params_fetched = time.monotonic()
+            self._params = params
+
+    def txn_params(self, fee: int = None):
+        """params for one transaction, a private copy when the fee is overridden or estimated"""
+        params = self.params
+        if fee is None and self.fee_estimator is not None:
+            fee = self.fee_estimator.fee(self.target_rounds)
+        if fee is None or fee == params.fee:
+            return params
+        params = copy(params)
+        params.fee = fee
+        return params
+
+    def set_fee(self, fee: int) -> None:
+        """change the default flat fee by publishing new params, calls already holding the old ones are unaffected"""
+        current = self.params
+        with _params_lock:
+            # a refresh may have published newer params since the read above
+            params = copy(self._params or current)
+            params.fee = fee
+            self.txns_fee = fee
+            self._params = params
@@ -0,0 +1,79 @@
+from typing import Union
+
+from Batch import MAX_GROUP_SIZE
+
+MIN_BALANCE = 100000
+ASSET_MIN_BALANCE = 100000
+APP_MIN_BALANCE = 100000
+UINT_MIN_BALANCE = 28500
+BYTES_MIN_BALANCE = 50000
+PAGE_MIN_BALANCE = 100000
+
+
+def min_balance(account_info: dict) -> int:
+    """the minimum balance algod enforces, computed from algod account info"""
+    schema = account_info.get("apps-total-schema", {})
+    apps = len(account_info.get("apps-local-state", [])) + len(account_info.get("created-apps", []))
+    return (MIN_BALANCE
+        + ASSET_MIN_BALANCE * len(account_info.get("assets", []))
+        + APP_MIN_BALANCE * apps
+        + UINT_MIN_BALANCE * schema.get("num-uint", 0)
+        + BYTES_MIN_BALANCE * schema.get("num-byte-slice", 0)
+        + PAGE_MIN_BALANCE * account_info.get("apps-total-extra-pages", 0))
+
+def plan_opt_changes(account_info: dict, target_ids, txn_fee: int, fee_amount: int = 0,
+    eng_id: Union[int, None] = None, prune: bool = False) -> dict:
+    """opt-ins (and with prune, close-outs) that bring the holdings to target_ids, checked group by group
+    against the min balance, close-outs go first so the min balance they free pays for the opt-ins.
+    only empty holdings are closed out, a close-out sends the whole balance away so funded ones are blocked"""
+    holdings = {holding["asset-id"]: holding for holding in account_info.get("assets", [])}
+    created = {asset["index"] for asset in account_info.get("created-assets", [])}
+    target_ids = set(target_ids)
+    opt_in = sorted(target_ids - holdings.keys())
+    opt_out = []
+    blocked = []
+    if prune:
+        for asset_id in sorted(holdings.keys() - target_ids):
+            if asset_id in created:
+                blocked.append({"asset-id": asset_id, "reason": "created by this account"})
+            elif asset_id == eng_id:
+                blocked.append({"asset-id": asset_id, "reason": "pays the service fee"})
+            elif holdings[asset_id].get("amount", 0) > 0:
+                blocked.append({"asset-id": asset_id, "reason": "holds a balance", "amount": holdings[asset_id]["amount"]})
+            else:
+                opt_out.append(holdings[asset_id])
+
+    # same chunking as Batch.aBatch.groups: 15 operations and one service fee transaction per group
+    per_group = MAX_GROUP_SIZE - 1
+    changes = [-ASSET_MIN_BALANCE] * len(opt_out) + [ASSET_MIN_BALANCE] * len(opt_in)
+    balance = account_info["amount"]
+    current = min_balance(account_info)
+    network_fees = service_fees = shortfall = 0
+    groups = 0
+    for start in range(0, len(changes), per_group):
+        chunk = changes[start:start + per_group]
+        txns = len(chunk) + (1 if fee_amount > 0 else 0)
+        group_service_fee = fee_amount * len(chunk)
+        network_fees += txn_fee * txns
+        service_fees += group_service_fee
+        balance -= txn_fee * txns + (group_service_fee if not isinstance(eng_id, int) else 0)
+        current += sum(chunk)
+        shortfall = max(shortfall, current - balance)
+        groups += 1
+
+    fee_asset_shortfall = 0
+    if isinstance(eng_id, int) and service_fees:
+        fee_asset_shortfall = max(0, service_fees - holdings.get(eng_id, {}).get("amount", 0))
+    return {
+        "opt_in": opt_in,
+        "opt_out": [holding["asset-id"] for holding in opt_out],
+        "opt_out_holdings": opt_out,
+        "blocked": blocked,
+        "groups": groups,
+        "network_fees": network_fees,
+        "service_fees": service_fees,
+        "min_balance": min_balance(account_info),
+        "min_balance_after": current,
+        "available": account_info["amount"],
+        "shortfall": shortfall,
+        "fee_asset_shortfall": fee_asset_shortfall}
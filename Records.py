@@ -0,0 +1,129 @@
+import base64
+from sys import intern
+
+from algosdk.util import microalgos_to_algos
+
+from Misc import find_amount_w_decimal, timestamp_to_string
+
+
+class TxnRecord:
+    """compact transaction record, keeps raw integers and renders strings only when serialized"""
+    __slots__ = ("txid", "tx_type", "sender", "receiver", "amount", "fee", "round_time", "confirmed_round", "note")
+
+    def __init__(self, txid: str, tx_type: str, sender: str, receiver: str, amount: int, fee: int,
+        round_time: int, confirmed_round: int, note: str = None):
+        self.txid = txid
+        self.tx_type = intern(tx_type)
+        self.sender = intern(sender)
+        self.receiver = intern(receiver)
+        self.amount = amount
+        self.fee = fee
+        self.round_time = round_time
+        self.confirmed_round = confirmed_round
+        self.note = note # base64, decoded on demand
+
+    def link(self, explorer_tx_url: str) -> str:
+        """explorer link for the transaction"""
+        return f"{explorer_tx_url}{self.txid}"
+
+    def decoded_note(self) -> str:
+        """the note as text"""
+        if self.note is None:
+            return ""
+        return base64.b64decode(self.note).decode()
+
+    def is_sent_by(self, wallet_addr: str) -> bool:
+        return self.sender == wallet_addr
+
+
+class PayRecord(TxnRecord):
+    """algo payment, amount in microalgos"""
+    __slots__ = ()
+
+    @classmethod
+    def from_indexer(cls, transaction: dict) -> "PayRecord":
+        return cls(
+            transaction["id"],
+            transaction["tx-type"],
+            transaction["sender"],
+            transaction["payment-transaction"]["receiver"],
+            transaction["payment-transaction"]["amount"],
+            transaction["fee"],
+            transaction["round-time"],
+            transaction.get("confirmed-round", 0),
+            transaction.get("note"))
+
+    def as_dict(self, explorer_tx_url: str) -> dict:
+        """the dict view returned by aWallet.algo_transactions"""
+        return {
+            "sender": self.sender,
+            "receiver": self.receiver,
+            "amount": str(microalgos_to_algos(self.amount)),
+            "fee": str(microalgos_to_algos(self.fee)),
+            "timestamp": timestamp_to_string(self.round_time),
+            "tx_type": self.tx_type,
+            "txid": self.txid,
+            "link": self.link(explorer_tx_url)}
+
+
+class AxferRecord(TxnRecord):
+    """asset transfer, amount in the asset's base units"""
+    __slots__ = ("asset_id", "asset", "unit", "decimal")
+
+    def __init__(self, *args, asset_id: int = 0, asset: str = "", unit: str = "", decimal: int = 0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.asset_id = asset_id
+        self.asset = asset
+        self.unit = unit
+        self.decimal = decimal
+
+    @classmethod
+    def from_indexer(cls, transaction: dict, asset_params: dict = None) -> "AxferRecord":
+        """asset_params is the algod params of the asset, name/unit/decimals are read from it"""
+        axfer = transaction["asset-transfer-transaction"]
+        asset_params = asset_params or {}
+        return cls(
+            transaction["id"],
+            transaction["tx-type"],
+            transaction["sender"],
+            axfer["receiver"],
+            int(axfer["amount"]),
+            transaction["fee"],
+            transaction["round-time"],
+            transaction.get("confirmed-round", 0),
+            transaction.get("note"),
+            asset_id=axfer["asset-id"],
+            asset=asset_params.get("name", ""),
+            unit=asset_params.get("unit-name", ""),
+            decimal=asset_params.get("decimals", 0))
+
+    def display_amount(self):
+        """amount with the asset decimals applied"""
+        return find_amount_w_decimal(self.amount, self.decimal)
+
+    def as_dict(self, explorer_tx_url: str) -> dict:
+        """the dict view returned by aWallet.asset_transactions"""
+        return {
+            "asset": self.asset,
+            "unit": self.unit,
+            "decimal": self.decimal,
+            "amount": self.display_amount(),
+            "sender": self.sender,
+            "receiver": self.receiver,
+            "fee": str(microalgos_to_algos(self.fee)),
+            "timestamp": timestamp_to_string(self.round_time),
+            "tx_type": self.tx_type,
+            "txid": self.txid,
+            "link": self.link(explorer_tx_url)}
+
+
+def split_sent_received(records: list, wallet_addr: str, explorer_tx_url: str) -> dict:
+    """render records into the sent/received dict shape used by the wallet history methods"""
+    sent = []
+    received = []
+    for record in records:
+        if record.is_sent_by(wallet_addr):
+            sent.append(record.as_dict(explorer_tx_url))
+        else:
+            received.append(record.as_dict(explorer_tx_url))
+    return {"sent": sent, "received": received}
@@ -0,0 +1,83 @@
+import csv
+import json
+from itertools import islice
+
+from algosdk.v2client.indexer import IndexerClient
+
+from Misc import iter_asset_holders
+
+HOLDER_FIELDS = ["address", "amount", "is_frozen", "opted_in_at_round"]
+
+
+def _holder_row(balance: dict) -> dict:
+    """flatten an indexer balance entry into a snapshot row"""
+    return {
+        "address": balance["address"],
+        "amount": int(balance["amount"]),
+        "is_frozen": balance.get("is-frozen", False),
+        "opted_in_at_round": balance.get("opted-in-at-round", 0)}
+
+def _chunks(rows, chunk_size: int):
+    """split an iterator into lists of at most chunk_size rows"""
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def _write_csv(chunks, path: str) -> int:
+    count = 0
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=HOLDER_FIELDS)
+        writer.writeheader()
+        for chunk in chunks:
+            writer.writerows(chunk)
+            count += len(chunk)
+    return count
+
+def _write_ndjson(chunks, path: str) -> int:
+    count = 0
+    with open(path, "w") as f:
+        for chunk in chunks:
+            f.write("".join(json.dumps(row) + "\n" for row in chunk))
+            count += len(chunk)
+    return count
+
+def _write_parquet(chunks, path: str) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("pyarrow is required to export holders to parquet")
+    schema = pa.schema([
+        ("address", pa.string()),
+        ("amount", pa.uint64()),
+        ("is_frozen", pa.bool_()),
+        ("opted_in_at_round", pa.uint64())])
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunks:
+            columns = {field: [row[field] for row in chunk] for field in HOLDER_FIELDS}
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            count += len(chunk)
+    return count
+
+WRITERS = {
+    "csv": _write_csv,
+    "ndjson": _write_ndjson,
+    "parquet": _write_parquet,
+}
+
+
+def holder_snapshot(client: IndexerClient, asset_id: int, min_amount: int = 0, include_zero: bool = True):
+    """lazily yield snapshot rows for every holder of an asset"""
+    for balance in iter_asset_holders(client, asset_id, min_amount=min_amount, include_zero=include_zero):
+        yield _holder_row(balance)
+
+def export_holders(client: IndexerClient, asset_id: int, path: str, fmt: str = "csv",
+    min_amount: int = 0, include_zero: bool = True, chunk_size: int = 10000) -> int:
+    """write a holder snapshot of an asset to csv, ndjson or parquet, returns the number of holders written"""
+    if fmt not in WRITERS:
+        raise ValueError(f"unsupported snapshot format: {fmt}")
+    rows = holder_snapshot(client, asset_id, min_amount=min_amount, include_zero=include_zero)
+    return WRITERS[fmt](_chunks(rows, chunk_size), path)
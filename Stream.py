@@ -0,0 +1,176 @@
+import codecs
+import json
+import re
+
+CHUNK_SIZE = 1 << 16
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+_NUMBER_CHARS = "0123456789+-.eE"
+_STRING_END = re.compile(r'["\\]')
+
+
+class _Buffer:
+    """text buffer refilled from an iterator of byte chunks"""
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """append the next chunk, dropping consumed text, False at end of input"""
+        if self.eof:
+            return False
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.eof = True
+            self.text = self.text[self.pos:] + self.utf8.decode(b"", final=True)
+        else:
+            self.text = self.text[self.pos:] + self.utf8.decode(chunk)
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """next non-whitespace character, empty at end of input"""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+    def decode_value(self):
+        """decode one complete json value at the current position"""
+        if self.peek() == "":
+            raise ValueError("unexpected end of json")
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # a number running to the end of the buffer may continue in the next chunk, raw_decode stops
+            # early on a split like "1." or "1e" so the rest of the number token is checked too
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and not self.eof:
+                token_end = end
+                while token_end < len(self.text) and self.text[token_end] in _NUMBER_CHARS:
+                    token_end += 1
+                if token_end == len(self.text) and self.fill():
+                    continue
+            self.pos = end
+            return value
+
+    def skip_value(self) -> None:
+        """move past one json value without keeping it. a container that is complete in the buffer is parsed once,
+        one that runs past it is walked child by child so text is dropped as it is consumed and nothing is re-parsed"""
+        c = self.peek()
+        if c == "":
+            raise ValueError("unexpected end of json")
+        if c == '"':
+            self._skip_string()
+            return
+        if c not in "{[":
+            self.decode_value()
+            return
+        try:
+            self.pos = _decoder.raw_decode(self.text, self.pos)[1]
+            return
+        except json.JSONDecodeError:
+            pass
+        close = "}" if c == "{" else "]"
+        self.pos += 1
+        if self.peek() == close:
+            self.pos += 1
+            return
+        while True:
+            if c == "{":
+                self._skip_string()
+                if self.peek() != ":":
+                    raise ValueError("malformed json object")
+                self.pos += 1
+            self.skip_value()
+            separator = self.peek()
+            self.pos += 1
+            if separator == close:
+                return
+            if separator != ",":
+                raise ValueError("malformed json")
+
+    def _skip_string(self) -> None:
+        if self.peek() != '"':
+            raise ValueError("malformed json string")
+        self.pos += 1
+        while True:
+            match = _STRING_END.search(self.text, self.pos)
+            if match is None or (match.group() == "\\" and match.end() == len(self.text)):
+                # keep a trailing backslash so its escaped character is seen with the next chunk
+                self.pos = match.start() if match is not None else len(self.text)
+                if not self.fill():
+                    raise ValueError("unexpected end of json")
+                continue
+            self.pos = match.end()
+            if match.group() == '"':
+                return
+            self.pos += 1
+
+
+def iter_json_items(chunks, path: tuple):
+    """yield the items of the array at path (a tuple of object keys) without loading the whole document"""
+    buf = _Buffer(chunks)
+    keys = []
+    path = list(path)
+    # walk down the object keys leading to the array, skipping every other value whole
+    while True:
+        c = buf.peek()
+        if c == "":
+            return
+        if c == "{" and (not keys or keys == path[:len(keys)]):
+            buf.pos += 1
+            if buf.peek() == "}":
+                return
+            key = buf.decode_value()
+            if buf.peek() != ":":
+                raise ValueError("malformed json object")
+            buf.pos += 1
+            keys.append(key)
+            continue
+        if c == "[" and keys == path:
+            buf.pos += 1
+            break
+        if not keys:
+            return
+        # not on the path: skip this value, then move to the next key of the same object
+        buf.skip_value()
+        c = buf.peek()
+        while c == "}":
+            buf.pos += 1
+            keys.pop()
+            if not keys:
+                return
+            c = buf.peek()
+        if c != ",":
+            raise ValueError("malformed json object")
+        buf.pos += 1
+        keys[-1] = buf.decode_value()
+        if buf.peek() != ":":
+            raise ValueError("malformed json object")
+        buf.pos += 1
+    # inside the target array
+    while True:
+        c = buf.peek()
+        if c == "]" or c == "":
+            return
+        if c == ",":
+            buf.pos += 1
+            continue
+        yield buf.decode_value()
+
+def iter_response_items(response, path: tuple, chunk_size: int = CHUNK_SIZE):
+    """stream the array at path out of a requests response opened with stream=True"""
+    try:
+        yield from iter_json_items(response.iter_content(chunk_size), path)
+    finally:
+        response.close()
@@ -0,0 +1,121 @@
+import base64
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.error import URLError
+
+from algosdk import encoding
+from algosdk.error import AlgodHTTPError
+from algosdk.v2client.algod import AlgodClient
+
+TRANSIENT_CODES = {429, 500, 502, 503, 504}
+
+
+class SubmissionExpired(Exception):
+    """the group passed its last valid round without being confirmed"""
+
+
+class aSubmitQueue(AlgodClient):
+    """idempotent, pipelined submission of signed groups keyed by the first txid"""
+    def __init__(self, algod_url: str, explorer_tx_url: str, workers: int = 8, retry_delay: float = 1.0,
+        max_confirmed: int = 10000):
+        self.algod_client = AlgodClient("", algod_url)
+        self.explorer_tx_url = explorer_tx_url
+        self.retry_delay = retry_delay
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.lock = threading.Lock()
+        self.inflight = {}
+        self.confirmed = {} # txid -> result of the most recent max_confirmed groups, oldest first
+        self.max_confirmed = max_confirmed
+
+    def submit(self, signed_group: list) -> Future:
+        """queue a signed group, resubmitting the same group returns the existing future or result"""
+        txid = signed_group[0].transaction.get_txid()
+        with self.lock:
+            if txid in self.confirmed:
+                future = Future()
+                future.set_result(self.confirmed[txid])
+                return future
+            if txid in self.inflight:
+                return self.inflight[txid]
+            raw = b"".join(base64.b64decode(encoding.msgpack_encode(stxn)) for stxn in signed_group)
+            last_valid = min(stxn.transaction.last_valid_round for stxn in signed_group)
+            future = self.pool.submit(self._deliver, txid, base64.b64encode(raw), last_valid)
+            self.inflight[txid] = future
+        future.add_done_callback(lambda _: self._settle(txid))
+        return future
+
+    def submit_many(self, signed_groups: list) -> list:
+        return [self.submit(group) for group in signed_groups]
+
+    def send_transactions(self, signed_group: list) -> str:
+        """drop-in for AlgodClient.send_transactions that waits for confirmation"""
+        return self.submit(signed_group).result()["txid"]
+
+    def _settle(self, txid: str) -> None:
+        with self.lock:
+            future = self.inflight.pop(txid, None)
+            if future is not None and future.exception() is None:
+                self.confirmed[txid] = future.result()
+                if len(self.confirmed) > self.max_confirmed:
+                    del self.confirmed[next(iter(self.confirmed))]
+
+    def _confirmed_round(self, txid: str) -> int:
+        """confirmed round from the node's pending pool, 0 if not confirmed yet"""
+        try:
+            info = self.algod_client.pending_transaction_info(txid)
+        except AlgodHTTPError as e:
+            if e.code == 404:
+                return 0
+            raise
+        if info.get("pool-error"):
+            raise AlgodHTTPError(info["pool-error"], 400)
+        return info.get("confirmed-round", 0)
+
+    def _deliver(self, txid: str, payload: bytes, last_valid: int) -> dict:
+        """send the same bytes until the group is confirmed or can no longer land"""
+        sent = False
+        while True:
+            try:
+                # status first, so a group confirmed in last_valid is seen by the check below before expiring it
+                current = self.algod_client.status()["last-round"]
+                if sent:
+                    confirmed_round = self._confirmed_round(txid)
+                    if confirmed_round:
+                        return {"txid": txid, "link": f"{self.explorer_tx_url}{txid}", "confirmed-round": confirmed_round}
+                if current > last_valid:
+                    raise SubmissionExpired(f"{txid} not confirmed by round {last_valid}")
+                try:
+                    self.algod_client.send_raw_transaction(payload)
+                except AlgodHTTPError as e:
+                    # a duplicate means an earlier attempt got through
+                    if "already in ledger" in str(e):
+                        return {"txid": txid, "link": f"{self.explorer_tx_url}{txid}", "confirmed-round": self._confirmed_round(txid)}
+                    if "already in pool" not in str(e):
+                        raise
+                sent = True
+                self.algod_client.status_after_block(current)
+            except AlgodHTTPError as e:
+                if e.code not in TRANSIENT_CODES:
+                    raise
+                time.sleep(self.retry_delay)
+            except (URLError, TimeoutError, ConnectionError):
+                time.sleep(self.retry_delay)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.pool.shutdown(wait=wait)
+
+
+class aSubmitter:
+    """routes group submission through submit_queue when one is set, checked by validator first when one is set"""
+    submit_queue = None
+    validator = None # optional Validate.aGroupValidator
+
+    @property
+    def submitter(self):
+        target = self.algod_client
+        if self.submit_queue is not None:
+            target = self.submit_queue
+        if self.validator is not None:
+            return self.validator.guard(target)
+        return target
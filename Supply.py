@@ -0,0 +1,161 @@
+import bisect
+import threading
+import time
+
+from algosdk.v2client.indexer import IndexerClient
+
+from a_constants import ZERO_ADDRESS
+
+BURN_ADDRESSES = (ZERO_ADDRESS,)
+ROLE_KEYS = ("manager", "reserve", "freeze", "clawback")
+
+
+class aSupply:
+    """holder balances of one asset and the supply figures derived from them, kept current from new transfers"""
+    def __init__(self, asset_id: int, params: dict, balances: dict, round_number: int, burn_addresses=BURN_ADDRESSES):
+        self.asset_id = asset_id
+        self.params = params
+        self.balances = balances
+        self.round = round_number
+        self.burn_addresses = set(burn_addresses)
+        self.pages = []
+
+    @classmethod
+    def from_indexer(cls, client: IndexerClient, asset_id: int, burn_addresses=BURN_ADDRESSES, page_size: int = 1000) -> "aSupply":
+        """snapshot every holder. each balances page is read at its own round, so the round of the page covering an
+        address is kept and sync skips that address's transfers up to it, no transfer is counted twice or missed"""
+        params = client.asset_info(asset_id)["asset"]["params"]
+        balances = {}
+        pages = []
+        next_page = None
+        while True:
+            response = client.asset_balances(asset_id, limit=page_size, next_page=next_page)
+            holders = response.get("balances", [])
+            for holder in holders:
+                balances[holder["address"]] = holder["amount"]
+            # balances are paged in address order, a page covers every address up to its last one
+            if holders:
+                pages.append((holders[-1]["address"], response["current-round"]))
+            next_page = response.get("next-token")
+            if not next_page or not holders:
+                break
+        round_number = pages[0][1] if pages else client.health()["round"]
+        supply = cls(asset_id, params, {address: amount for address, amount in balances.items() if amount}, round_number, burn_addresses)
+        supply.pages = pages
+        return supply
+
+    def _as_of(self, address: str) -> int:
+        """round the snapshot balance of an address was read at"""
+        if not self.pages:
+            return self.round
+        i = bisect.bisect_left(self.page_ends, address)
+        return self.pages[min(i, len(self.pages) - 1)][1]
+
+    @property
+    def pages(self) -> list:
+        return self._pages
+
+    @pages.setter
+    def pages(self, pages: list) -> None:
+        self._pages = pages
+        self.page_ends = [end for end, _ in pages]
+
+    def _credit(self, address: str, amount: int, round_number: int) -> None:
+        if amount and round_number > self._as_of(address):
+            self.balances[address] = self.balances.get(address, 0) + amount
+
+    def _move(self, sender_addr: str, receiver_addr: str, amount: int, round_number: int) -> None:
+        self._credit(sender_addr, -amount, round_number)
+        self._credit(receiver_addr, amount, round_number)
+
+    def apply(self, transaction: dict, round_number: int = None) -> None:
+        """apply one indexer transaction of this asset, inner transactions included"""
+        if round_number is None:
+            round_number = transaction["confirmed-round"]
+        if "asset-transfer-transaction" in transaction:
+            axfer = transaction["asset-transfer-transaction"]
+            if axfer["asset-id"] == self.asset_id:
+                # on a clawback the indexer reports the revoked account as the transfer sender
+                source = axfer.get("sender") or transaction["sender"]
+                self._move(source, axfer["receiver"], axfer["amount"], round_number)
+                if axfer.get("close-to"):
+                    self._move(source, axfer["close-to"], axfer.get("close-amount", 0), round_number)
+                    if round_number > self._as_of(source):
+                        self.balances.pop(source, None)
+        elif "asset-config-transaction" in transaction:
+            acfg = transaction["asset-config-transaction"]
+            if acfg.get("asset-id") == self.asset_id:
+                params = acfg.get("params")
+                if not params:
+                    # destroyed, the creator held the whole supply
+                    self.params = dict(self.params, total=0)
+                    self.balances.clear()
+                else:
+                    self.params = dict(self.params, **{key: params.get(key, "") for key in ROLE_KEYS})
+        for inner in transaction.get("inner-txns", []):
+            self.apply(inner, round_number)
+
+    def sync(self, client: IndexerClient, page_size: int = 1000) -> int:
+        """apply the transactions of this asset since the last snapshot or sync, returns how many were read"""
+        target = client.health()["round"]
+        if target <= self.round:
+            return 0
+        # read every page before applying any, a failed page must not leave half the range applied
+        transactions = []
+        next_page = None
+        while True:
+            response = client.search_asset_transactions(self.asset_id, limit=page_size, next_page=next_page,
+                min_round=self.round + 1, max_round=target)
+            transactions.extend(response.get("transactions", []))
+            next_page = response.get("next-token")
+            if not next_page or not response.get("transactions"):
+                break
+        for transaction in transactions:
+            self.apply(transaction)
+        self.round = target
+        if self.pages and target >= self.pages[-1][1]:
+            self.pages = []
+        return len(transactions)
+
+    def locked_addresses(self) -> set:
+        """supply held by the reserve and the creator is not circulating"""
+        return {address for address in (self.params.get("reserve"), self.params.get("creator")) if address}
+
+    def burned(self) -> int:
+        return sum(self.balances.get(address, 0) for address in self.burn_addresses)
+
+    def locked(self) -> int:
+        return sum(self.balances.get(address, 0) for address in self.locked_addresses() - self.burn_addresses)
+
+    def circulating(self) -> int:
+        """total minus what the reserve, the creator and the burn addresses hold, in base units"""
+        return max(self.params.get("total", 0) - self.locked() - self.burned(), 0)
+
+
+class aSupplyCache:
+    """aSupply per asset, snapshotted on first use and synced from new transfers at most every refresh_seconds"""
+    def __init__(self, indexer_url: str, burn_addresses=BURN_ADDRESSES, refresh_seconds: float = 30.0):
+        self.indexer_client = IndexerClient("", indexer_url)
+        self.burn_addresses = burn_addresses
+        self.refresh_seconds = refresh_seconds
+        self.supplies = {}
+        self.synced = {}
+        self.lock = threading.Lock()
+
+    def get(self, asset_id: int) -> aSupply:
+        with self.lock:
+            supply = self.supplies.get(asset_id)
+            if supply is None:
+                supply = aSupply.from_indexer(self.indexer_client, asset_id, self.burn_addresses)
+                self.supplies[asset_id] = supply
+                self.synced[asset_id] = time.monotonic()
+            elif time.monotonic() - self.synced[asset_id] > self.refresh_seconds:
+                supply.sync(self.indexer_client)
+                self.synced[asset_id] = time.monotonic()
+            return supply
+
+    def discard(self, asset_id: int) -> None:
+        """forget an asset so the next get takes a fresh snapshot"""
+        with self.lock:
+            self.supplies.pop(asset_id, None)
+            self.synced.pop(asset_id, None)
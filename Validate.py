@@ -0,0 +1,284 @@
+import threading
+from copy import copy
+
+from algosdk.future.transaction import (AssetConfigTxn, AssetFreezeTxn,
+                                        AssetTransferTxn, PaymentTxn,
+                                        calculate_group_id)
+
+from Caches import aCache, asset_params_cache
+from Planner import ASSET_MIN_BALANCE, min_balance
+
+MIN_FEE = 1000
+MAX_GROUP_SIZE = 16
+MAX_TXN_LIFE = 1000
+MAX_NOTE_BYTES = 1024
+MAX_ASSET_NAME_BYTES = 32
+MAX_UNIT_NAME_BYTES = 8
+MAX_URL_BYTES = 96
+MAX_DECIMALS = 19
+MAX_UINT64 = 2 ** 64 - 1
+
+
+class InvalidGroup(ValueError):
+    """a group algod would reject, problems lists every reason found"""
+    def __init__(self, problems: list):
+        super().__init__("; ".join(problems))
+        self.problems = problems
+
+
+def _size(value) -> int:
+    if value is None:
+        return 0
+    return len(value.encode() if isinstance(value, str) else value)
+
+def _account_state(info: dict) -> dict:
+    return {
+        "amount": info.get("amount", 0),
+        "min-balance": info.get("min-balance") or min_balance(info),
+        "assets": {holding["asset-id"]: {"amount": holding["amount"], "is-frozen": holding.get("is-frozen", False)}
+            for holding in info.get("assets", [])}}
+
+def _is_destroy(txn: AssetConfigTxn) -> bool:
+    return bool(txn.index) and txn.total is None and not (txn.manager or txn.reserve or txn.freeze or txn.clawback)
+
+def field_problems(txn) -> list:
+    """limits algod enforces on a single transaction"""
+    problems = []
+    if _size(txn.note) > MAX_NOTE_BYTES:
+        problems.append(f"note longer than {MAX_NOTE_BYTES} bytes")
+    if txn.first_valid_round > txn.last_valid_round:
+        problems.append("first valid round after last valid round")
+    elif txn.last_valid_round - txn.first_valid_round > MAX_TXN_LIFE:
+        problems.append(f"validity window longer than {MAX_TXN_LIFE} rounds")
+    if txn.fee < 0:
+        problems.append("negative fee")
+    if isinstance(txn, AssetConfigTxn) and not txn.index:
+        if _size(txn.asset_name) > MAX_ASSET_NAME_BYTES:
+            problems.append(f"asset name longer than {MAX_ASSET_NAME_BYTES} bytes")
+        if _size(txn.unit_name) > MAX_UNIT_NAME_BYTES:
+            problems.append(f"unit name longer than {MAX_UNIT_NAME_BYTES} bytes")
+        if _size(txn.url) > MAX_URL_BYTES:
+            problems.append(f"url longer than {MAX_URL_BYTES} bytes")
+        if not 0 <= txn.decimals <= MAX_DECIMALS:
+            problems.append(f"decimals outside 0-{MAX_DECIMALS}")
+        if txn.metadata_hash is not None and len(txn.metadata_hash) != 32:
+            problems.append("metadata hash is not 32 bytes")
+        if txn.total is not None and not 0 <= txn.total <= MAX_UINT64:
+            problems.append("total supply outside uint64")
+    if isinstance(txn, (AssetTransferTxn, PaymentTxn)):
+        amount = txn.amount if isinstance(txn, AssetTransferTxn) else txn.amt
+        if not 0 <= amount <= MAX_UINT64:
+            problems.append("amount outside uint64")
+    return problems
+
+def group_problems(signed_group: list, min_fee: int = MIN_FEE) -> list:
+    """group size, signatures, group id and pooled fee"""
+    if not 1 <= len(signed_group) <= MAX_GROUP_SIZE:
+        return [f"group of {len(signed_group)} transactions, expected 1-{MAX_GROUP_SIZE}"]
+    problems = []
+    txns = [stxn.transaction for stxn in signed_group]
+    for i, stxn in enumerate(signed_group):
+        if not (getattr(stxn, "signature", None) or getattr(stxn, "multisig", None) or getattr(stxn, "lsig", None)):
+            problems.append(f"txn {i} is not signed")
+        problems.extend(f"txn {i}: {problem}" for problem in field_problems(stxn.transaction))
+    if len({txn.genesis_hash for txn in txns}) > 1:
+        problems.append("transactions for different networks")
+    if len(txns) > 1 or txns[0].group:
+        unsigned = [copy(txn) for txn in txns]
+        for txn in unsigned:
+            txn.group = None
+        gid = calculate_group_id(unsigned)
+        if any(txn.group != gid for txn in txns):
+            problems.append("group id does not match the transactions")
+    fees = sum(txn.fee for txn in txns)
+    if fees < min_fee * len(txns):
+        problems.append(f"fees of {fees} below the {min_fee * len(txns)} minimum for {len(txns)} transactions")
+    return problems
+
+
+class aGroupValidator:
+    """rejects bad signed groups in-process before they reach the node.
+    account and asset state come from cached algod lookups, and a sent group's effects are applied to the cache"""
+    def __init__(self, algod_client, min_fee: int = MIN_FEE):
+        self.algod_client = algod_client
+        self.min_fee = min_fee
+        self.accounts = aCache(lambda address: _account_state(algod_client.account_info(address)))
+        self.assets = asset_params_cache(algod_client)
+        # validate and commit run under one lock, so concurrent groups see each other's effects
+        self.lock = threading.Lock()
+
+    def refresh(self) -> None:
+        """drop cached state, e.g. after transactions sent outside the validator"""
+        self.accounts.clear()
+        self.assets.clear()
+
+    def _apply(self, txn, state: dict, problems: list, destroyed: set) -> None:
+        """replay one transaction on private copies of the touched accounts"""
+        def account(address):
+            if address not in state:
+                cached = self.accounts.get(address)
+                state[address] = dict(cached, assets={key: dict(value) for key, value in cached["assets"].items()})
+            return state[address]
+
+        sender = account(txn.sender)
+        sender["amount"] -= txn.fee
+        if isinstance(txn, PaymentTxn):
+            sender["amount"] -= txn.amt
+            if txn.receiver:
+                account(txn.receiver)["amount"] += txn.amt
+            if txn.close_remainder_to:
+                if sender["amount"] < 0:
+                    problems.append(f"{txn.sender} can't cover the amount and fee")
+                if sender["assets"]:
+                    problems.append(f"{txn.sender} must close out its assets before closing the account")
+                account(txn.close_remainder_to)["amount"] += max(sender["amount"], 0)
+                sender["amount"] = 0
+                sender["closed"] = True
+        elif isinstance(txn, AssetTransferTxn):
+            self._apply_transfer(txn, account, problems)
+        elif isinstance(txn, AssetFreezeTxn):
+            params = self.assets.get(txn.index)
+            if not params:
+                problems.append(f"asset {txn.index} does not exist")
+            elif txn.sender != params.get("freeze"):
+                problems.append(f"{txn.sender} is not the freeze address of asset {txn.index}")
+            holding = account(txn.target)["assets"].get(txn.index)
+            if holding is None:
+                problems.append(f"{txn.target} is not opted into asset {txn.index}")
+            else:
+                holding["is-frozen"] = txn.new_freeze_state
+        elif isinstance(txn, AssetConfigTxn) and not txn.index:
+            # the new asset id and the creator's holding of it are only known once confirmed
+            sender["min-balance"] += ASSET_MIN_BALANCE
+            sender["stale"] = True
+        elif isinstance(txn, AssetConfigTxn):
+            self._apply_config(txn, account, problems, destroyed)
+        if sender["amount"] < 0:
+            problems.append(f"{txn.sender} can't cover the amount and fee")
+
+    def _apply_config(self, txn: AssetConfigTxn, account, problems: list, destroyed: set) -> None:
+        params = self.assets.get(txn.index)
+        if not params:
+            problems.append(f"asset {txn.index} does not exist")
+            return
+        if not params.get("manager"):
+            problems.append(f"asset {txn.index} is immutable")
+        elif txn.sender != params["manager"]:
+            problems.append(f"{txn.sender} is not the manager of asset {txn.index}")
+        if _is_destroy(txn):
+            creator = account(params["creator"])
+            holding = creator["assets"].get(txn.index, {"amount": 0})
+            if holding["amount"] != params.get("total", 0):
+                problems.append(f"asset {txn.index} can only be destroyed once the creator holds the whole supply")
+            creator["assets"].pop(txn.index, None)
+            creator["min-balance"] -= ASSET_MIN_BALANCE
+            destroyed.add(txn.index)
+
+    def _apply_transfer(self, txn: AssetTransferTxn, account, problems: list) -> None:
+        params = self.assets.get(txn.index)
+        sender = account(txn.sender)
+        # opt-in: a zero transfer to yourself
+        if txn.receiver == txn.sender and not txn.amount and not txn.revocation_target and not txn.close_assets_to:
+            if not params:
+                problems.append(f"asset {txn.index} does not exist")
+            elif txn.index not in sender["assets"]:
+                sender["assets"][txn.index] = {"amount": 0, "is-frozen": params.get("default-frozen", False)}
+                sender["min-balance"] += ASSET_MIN_BALANCE
+            return
+        if not params:
+            # only closing out a deleted asset is still possible
+            if not (txn.close_assets_to and txn.index in sender["assets"]):
+                problems.append(f"asset {txn.index} does not exist")
+            sender["assets"].pop(txn.index, None)
+            sender["min-balance"] -= ASSET_MIN_BALANCE
+            return
+        clawback = bool(txn.revocation_target)
+        if clawback and txn.sender != params.get("clawback"):
+            problems.append(f"{txn.sender} is not the clawback address of asset {txn.index}")
+        source_addr = txn.revocation_target if clawback else txn.sender
+        source = account(source_addr)["assets"].get(txn.index)
+        receiver = account(txn.receiver)["assets"].get(txn.index) if txn.receiver else None
+        if source is None:
+            problems.append(f"{source_addr} is not opted into asset {txn.index}")
+            return
+        if txn.receiver and receiver is None:
+            problems.append(f"{txn.receiver} is not opted into asset {txn.index}")
+        if not clawback and source["is-frozen"]:
+            problems.append(f"asset {txn.index} is frozen for {source_addr}")
+        if not clawback and receiver is not None and receiver["is-frozen"] and txn.receiver != params["creator"]:
+            problems.append(f"asset {txn.index} is frozen for {txn.receiver}")
+        if source["amount"] < txn.amount:
+            problems.append(f"{source_addr} holds {source['amount']} of asset {txn.index}, {txn.amount} needed")
+        else:
+            source["amount"] -= txn.amount
+            if receiver is not None:
+                receiver["amount"] += txn.amount
+        if txn.close_assets_to:
+            if txn.sender == params["creator"]:
+                problems.append(f"the creator can't close out asset {txn.index}")
+            close_to = account(txn.close_assets_to)["assets"].get(txn.index)
+            if close_to is None:
+                problems.append(f"{txn.close_assets_to} is not opted into asset {txn.index}")
+            elif source["is-frozen"] and txn.close_assets_to != params["creator"]:
+                problems.append(f"asset {txn.index} is frozen for {txn.sender}, close out to the creator")
+            else:
+                close_to["amount"] += max(source["amount"], 0)
+            sender["assets"].pop(txn.index, None)
+            sender["min-balance"] -= ASSET_MIN_BALANCE
+
+    def validate(self, signed_group: list) -> tuple:
+        """raise InvalidGroup with every problem found, returns the state to commit once the group is sent"""
+        problems = group_problems(signed_group, self.min_fee)
+        if problems:
+            raise InvalidGroup(problems)
+        state = {}
+        destroyed = set()
+        for stxn in signed_group:
+            self._apply(stxn.transaction, state, problems, destroyed)
+        for address, account in state.items():
+            empty = account["amount"] == 0 and not account["assets"]
+            if not account.get("closed") and not empty and account["amount"] < account["min-balance"]:
+                problems.append(f"{address} would be {account['min-balance'] - account['amount']} below its min balance")
+        if problems:
+            raise InvalidGroup(list(dict.fromkeys(problems)))
+        return state, destroyed
+
+    def commit(self, state: dict, destroyed: set) -> None:
+        """record the effects of a sent group in the cache, accounts the replay can't model are dropped and refetched"""
+        for address, account in state.items():
+            account.pop("closed", None)
+            if account.pop("stale", False):
+                self.accounts.discard(address)
+            else:
+                self.accounts.set(address, account)
+        for asset_id in destroyed:
+            self.assets.set(asset_id, {})
+
+    def forget(self, state: dict) -> None:
+        """drop the accounts of a group whose submission failed, its committed effects may not have happened"""
+        for address in state:
+            self.accounts.discard(address)
+
+    def guard(self, target):
+        """wrap an algod client or submit queue so send_transactions validates first"""
+        return _Validated(self, target)
+
+
+class _Validated:
+    def __init__(self, validator: aGroupValidator, target):
+        self.validator = validator
+        self.target = target
+
+    def send_transactions(self, signed_group: list) -> str:
+        # commit before sending so the next group is checked against this one's effects, undone if the send fails
+        with self.validator.lock:
+            state, destroyed = self.validator.validate(signed_group)
+            self.validator.commit(state, destroyed)
+        try:
+            return self.target.send_transactions(signed_group)
+        except Exception:
+            self.validator.forget(state)
+            raise
+
+    def __getattr__(self, name):
+        return getattr(self.target, name)
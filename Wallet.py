@@ -3,20 +3,22 @@ from algosdk.util import microalgos_to_algos
 from algosdk.v2client.algod import AlgodClient
 from algosdk.v2client.indexer import IndexerClient
 
-from Misc import find_amount_w_decimal, timestamp_to_string
+from Encoder import aAxferTemplate, aPayTemplate
+from Misc import find_amount_w_decimal
+from Params import aParams
+from Records import AxferRecord, PayRecord, split_sent_received
 
 
-class aWallet(AlgodClient, IndexerClient):
+class aWallet(aParams, AlgodClient, IndexerClient):
     def __init__(self, algod_url: str, indexer_url: str, fee: int,
     explorer_account_url: str, explorer_asset_url: str, explorer_tx_url: str):
         self.algod_client = AlgodClient("", algod_url)
         self.indexer_client = IndexerClient("", indexer_url)
-        self.params = self.algod_client.suggested_params()
-        self.params.flat_fee = True
-        self.params.fee = fee
+        self.txns_fee = fee
         self.explorer_account_url = explorer_account_url
         self.explorer_asset_url = explorer_asset_url
         self.explorer_tx_url = explorer_tx_url
+        self.history_cache = None # optional History.aHistoryCache
         
     def get_network_fee(self) -> str:
         """return the network fee"""
@@ -37,13 +39,23 @@ class aWallet(AlgodClient, IndexerClient):
         msg = f"{self.explorer_asset_url}{asset_id}"
         return msg
 
-    def send_algo(self, sender_addr: str, receiver: str, amount: int, note: str) -> dict:
+    def send_algo(self, sender_addr: str, receiver: str, amount: int, note: str, fee: int = None) -> dict:
         """generate algo payment object, for multiple or single transfers"""
-        return dict(PaymentTxn(sender_addr, self.params, receiver, amount, note=note).dictify())
+        sp = self.txn_params(fee)
+        return dict(PaymentTxn(sender_addr, sp, receiver, amount, note=note).dictify())
 
-    def send_asset(self, sender_addr: str, receiver: str, amount: int, asset_id: int, note: str) -> dict:
+    def send_asset(self, sender_addr: str, receiver: str, amount: int, asset_id: int, note: str, fee: int = None) -> dict:
         """generate asset transfer object"""
-        return dict(AssetTransferTxn(sender_addr, self.params, receiver, amount, asset_id, note=note).dictify())
+        sp = self.txn_params(fee)
+        return dict(AssetTransferTxn(sender_addr, sp, receiver, amount, asset_id, note=note).dictify())
+
+    def payment_template(self, sender_addr: str, note: str = None, fee: int = None) -> aPayTemplate:
+        """pre-encoded algo payments from one sender, template.encode(receiver, amount) for bulk transfers"""
+        return aPayTemplate(sender_addr, self.txn_params(fee), note)
+
+    def asset_template(self, sender_addr: str, asset_id: int, note: str = None, fee: int = None) -> aAxferTemplate:
+        """pre-encoded asset transfers from one sender, template.encode(receiver, amount) for bulk transfers"""
+        return aAxferTemplate(sender_addr, self.txn_params(fee), asset_id, note)
 
     def algo_balance(self, wallet_addr: str) -> dict:
         """returns algo balance"""
@@ -115,141 +127,42 @@ class aWallet(AlgodClient, IndexerClient):
         account_tokens = filter(lambda i: i["decimal"] == 0, account_tokens)# format list and drop 0 + x decimals
         return list(account_tokens)
     
+    def algo_records(self, wallet_addr: str, limit: int = None) -> list:
+        """algo transactions carried out by an account, as compact records.
+        with history_cache set, the first call for an account pages its whole history once, limit only trims the result"""
+        if self.history_cache is not None:
+            transactions = self.history_cache.sync_indexer(self.indexer_client, wallet_addr, "pay", limit=limit)
+        else:
+            response = self.indexer_client.search_transactions_by_address(address=wallet_addr, limit=limit, txn_type="pay")
+            transactions = response.get("transactions", [])
+        return [PayRecord.from_indexer(transaction) for transaction in transactions]
+
+    def asset_records(self, wallet_addr: str, limit: int = None, asset_id: int = None) -> list:
+        """asset transfer transactions carried out by an account, as compact records.
+        with history_cache set, the first call for an account pages its whole history once, limit only trims the result"""
+        if self.history_cache is not None:
+            transactions = self.history_cache.sync_indexer(self.indexer_client, wallet_addr, "axfer", asset_id=asset_id, limit=limit)
+        elif asset_id is None:
+            transactions = self.indexer_client.search_transactions_by_address(address=wallet_addr, limit=limit, txn_type="axfer").get("transactions", [])
+        else:
+            transactions = self.indexer_client.search_asset_transactions(address=wallet_addr, asset_id=asset_id, limit=limit, txn_type="axfer").get("transactions", [])
+        asset_params = {}
+        records = []
+        for transaction in transactions:
+            index = transaction["asset-transfer-transaction"]["asset-id"]
+            if index not in asset_params:
+                asset_params[index] = self.algod_client.asset_info(index).get("params", {})
+            records.append(AxferRecord.from_indexer(transaction, asset_params[index]))
+        return records
+
     def algo_transactions(self, wallet_addr: str, limit: int = None) -> dict:
         """algo transactions carried out by an account"""
-        transactions_dict = {}
-        sent = []
-        received = []
-        response = self.indexer_client.search_transactions_by_address(address=wallet_addr, limit=limit, txn_type="pay")
-        if "transactions" in response:
-            transactions = response["transactions"]
-            for transaction in transactions:
-                transact = {}
-                transact["sender"] = transaction["sender"]
-                transact["receiver"] = transaction["payment-transaction"]["receiver"]
-                transact["amount"] = str(microalgos_to_algos(transaction["payment-transaction"]["amount"]))
-                transact["fee"] = str(microalgos_to_algos(transaction["fee"]))
-                transact["timestamp"] = timestamp_to_string(transaction["round-time"])
-                transact["tx_type"] = transaction["tx-type"]
-                transact["txid"] = transaction["id"]
-                transact["link"] = f"{self.explorer_tx_url}{transaction['id']}"
-                if transact['sender'] == wallet_addr:
-                    sent.append(transact)
-                elif transact['sender'] != wallet_addr:
-                    received.append(transact)
-            transactions_dict['sent'] = sent
-            transactions_dict['received'] =  received
-        return transactions_dict
+        return split_sent_received(self.algo_records(wallet_addr, limit), wallet_addr, self.explorer_tx_url)
 
     def asset_transactions(self, wallet_addr: str, limit: int = None) -> dict:
         """all asset transfer transactions carried out by an account"""
-        transactions_dict = {}
-        sent = []
-        received = []
-        response = self.indexer_client.search_transactions_by_address(address=wallet_addr, limit=limit, txn_type="axfer")
-        if "transactions" in response:
-            transactions = response["transactions"]
-            for transaction in transactions:
-                transact = {}
-                transact["asset"] = ""
-                transact["unit"] = ""
-                transact["decimal"] = 0
-                transact["amount"] = int(transaction["asset-transfer-transaction"]["amount"])
-                info = self.algod_client.asset_info(transaction["asset-transfer-transaction"]["asset-id"])
-                if "params" in info:
-                    if "name" in info["params"]:
-                        transact["asset"] = info["params"]["name"]
-                    if "unit-name" in info["params"]:
-                        transact["unit"] = info["params"]["unit-name"]
-                    if "decimals" in info["params"] != 0:
-                        transact['decimal'] = info["params"]['decimals']
-                        transact['amount'] = find_amount_w_decimal(transaction["asset-transfer-transaction"]["amount"], info["params"]["decimals"])
-                transact["sender"] = transaction["sender"]
-                transact["receiver"] = transaction["asset-transfer-transaction"]["receiver"]
-                transact["fee"] = str(microalgos_to_algos(transaction["fee"]))
-                transact["timestamp"] = timestamp_to_string(transaction["round-time"])
-                transact["tx_type"] = transaction["tx-type"]
-                transact["txid"] = transaction["id"]
-                transact["link"] = f"{self.explorer_tx_url}{transaction['id']}"
-
-                if transact['sender'] == wallet_addr:
-                    sent.append(transact)
-                elif transact['sender'] != wallet_addr:
-                    received.append(transact)
-            transactions_dict['sent'] = sent
-            transactions_dict['received'] =  received
-        return transactions_dict
+        return split_sent_received(self.asset_records(wallet_addr, limit), wallet_addr, self.explorer_tx_url)
 
     def asset_transaction(self, wallet_addr: str, asset_id: int) -> dict:
         """all asset transfer transactions for an asset id by an account"""
-        transactions_dict = {}
-        sent = []
-        received = []
-        response = self.indexer_client.search_asset_transactions(address=wallet_addr, asset_id=asset_id, txn_type="axfer")
-        if "transactions" in response:
-            transactions = response["transactions"]
-            for transaction in transactions:
-                transact = {}
-                transact["asset"] = ""
-                transact["unit"] = ""
-                transact["decimal"] = 0
-                transact["amount"] = int(transaction["asset-transfer-transaction"]["amount"])
-                info = self.algod_client.asset_info(transaction["asset-transfer-transaction"]["asset-id"])
-                if "params" in info:
-                    if "name" in info["params"]:
-                        transact["asset"] = info["params"]["name"]
-                    if "unit-name" in info["params"]:
-                        transact["unit"] = info["params"]["unit-name"]
-                    if "decimals" in info["params"] != 0:
-                        transact['decimal'] = info["params"]['decimals']
-                        transact['amount'] = find_amount_w_decimal(transaction["asset-transfer-transaction"]["amount"], info["params"]["decimals"])
-                transact["sender"] = transaction["sender"]
-                transact["receiver"] = transaction["asset-transfer-transaction"]["receiver"]
-                transact["fee"] = str(microalgos_to_algos(transaction["fee"]))
-                transact["timestamp"] = timestamp_to_string(transaction["round-time"])
-                transact["tx_type"] = transaction["tx-type"]
-                transact["txid"] = transaction["id"]
-                transact["link"] = f"{self.explorer_tx_url}{transaction['id']}"
-
-                if transact['sender'] == wallet_addr:
-                    sent.append(transact)
-                elif transact['sender'] != wallet_addr:
-                    received.append(transact)
-            transactions_dict['sent'] = sent
-            transactions_dict['received'] =  received
-        return transactions_dict
-
-
-
-
-
-
-
-
-        
-
-        
-
-"""change to use only key"""
-
-"""
-Q5PXZU7PQWFPIRYSBDRSUM34PTZKL5INZAPFHFL23C6DWQ4A2IGX5WTPGE
-My address: 67EDQPXMWCQJYH7UN72ABWWT4NPCBAWAU4VGQMUHCHKBMNPNG2NTTL7XWM
-My private kay: dvW4GBNtWu1giommd17tlesIMmXYlUSr+ch2wqmmB+/3yDg+7LCgnB/0b/QA2tPjXiCCwKcqaDKHEdQWNe02mw==
-My passphrase: put toilet middle spell regular deputy fantasy maze visit keep wall rich balcony erode segment noise hammer trade good cherry fatal trust join abstract obey
-"""
-
-account1 = "67EDQPXMWCQJYH7UN72ABWWT4NPCBAWAU4VGQMUHCHKBMNPNG2NTTL7XWM"
-private_key = "dvW4GBNtWu1giommd17tlesIMmXYlUSr+ch2wqmmB+/3yDg+7LCgnB/0b/QA2tPjXiCCwKcqaDKHEdQWNe02mw=="
-
-
-af = aWallet("https://testnet-api.algonode.cloud", "https://testnet-idx.algonode.cloud", 1000, "", "", "")
-# print(af.send_algo(account1, account1, 1000, "hello"))
-
-
-print(af.asset_transactions("67EDQPXMWCQJYH7UN72ABWWT4NPCBAWAU4VGQMUHCHKBMNPNG2NTTL7XWM", 10))
-# import json
-
-# f = open("indexerassetxn.json", "w")
-# esp = af.indexer_client.search_asset_transactions(address="67EDQPXMWCQJYH7UN72ABWWT4NPCBAWAU4VGQMUHCHKBMNPNG2NTTL7XWM", asset_id=153974828, txn_type="axfer")
-# json.dump(esp, f, indent=4)
\ No newline at end of file
+        return split_sent_received(self.asset_records(wallet_addr, asset_id=asset_id), wallet_addr, self.explorer_tx_url)